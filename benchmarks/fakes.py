@@ -0,0 +1,397 @@
+"""
+Local stand-ins for the external services the pipeline calls.
+
+``FakeServices`` runs one HTTP server that answers like Tavily (``/search``),
+the OpenAI Chat Completions API (``/v1/chat/completions``), the Anthropic
+Messages API (``/v1/messages``), streaming included, and FRED's CSV download
+(``/fred/graph/fredgraph.csv``), with configurable latency. The real SDKs are
+pointed at it through ``OPENAI_BASE_URL`` / ``ANTHROPIC_BASE_URL``, so the
+code under test runs unchanged.
+
+``canned_market_data`` serves FinancialDataFetcher's market data. FRED goes
+through pandas-datareader's real request and CSV parsing against the fake
+server when given its URL. Yahoo Finance is not served over HTTP (yfinance
+hard-codes its hosts and needs a cookie/crumb handshake), so its two network
+calls are replaced by synthetic frames shaped like yfinance's: tz-aware from
+``Ticker.history``, tz-naive daily bars from ``yf.download``. yfinance's own
+parsing is therefore not covered by the benchmarks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from newsletter.data import FinancialDataFetcher
+
+
+_WORDS = (
+    "market volatility liquidity factor momentum signal regime alpha model risk portfolio "
+    "execution spread yield curve earnings revenue guidance inflation rates policy dollar "
+    "equities credit duration carry trend mean reversion dispersion correlation hedge"
+).split()
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _prose(seed: str, words: int) -> str:
+    rng = np.random.default_rng(_seed(seed))
+    picked = rng.choice(_WORDS, size=words)
+    sentences = [" ".join(picked[i:i + 12]).capitalize() + "." for i in range(0, words, 12)]
+    return " ".join(sentences)
+
+
+@dataclass
+class FakeConfig:
+    sections: int = 5
+    """Sections in the plan the fake LLM returns."""
+    llm_latency: float = 0.2
+    """Seconds before the fake LLM starts answering."""
+    llm_tokens_per_second: float = 400.0
+    """Generation speed; a response of N words takes about N / this longer."""
+    tavily_latency: float = 0.15
+    """Seconds per fake Tavily search."""
+    fred_latency: float = 0.05
+    """Seconds per fake FRED series download."""
+    section_words: int = 180
+    source_words: int = 300
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence per-request logging
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.calls[self.path] = self.server.calls.get(self.path, 0) + 1
+        if self.path.endswith("/search"):
+            self._tavily(body)
+        elif self.path.endswith("/chat/completions"):
+            self._openai(body)
+        elif self.path.endswith("/messages"):
+            self._anthropic(body)
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.server.calls[url.path] = self.server.calls.get(url.path, 0) + 1
+        if url.path.endswith("/fredgraph.csv"):
+            self._fred(parse_qs(url.query).get("id", [""])[0])
+        else:
+            self.send_error(404)
+
+    # -- helpers -----------------------------------------------------------
+
+    def _json(self, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_sse(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _sse(self, data: dict, event: Optional[str] = None) -> None:
+        prefix = f"event: {event}\n" if event else ""
+        self.wfile.write(f"{prefix}data: {json.dumps(data)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _chunks(self, text: str) -> Iterator[str]:
+        """Yield ``text`` a few words at a time at the configured generation speed."""
+        words = text.split(" ")
+        delay = 4 / self.server.config.llm_tokens_per_second
+        for i in range(0, len(words), 4):
+            time.sleep(delay)
+            yield " ".join(words[i:i + 4]) + (" " if i + 4 < len(words) else "")
+
+    def _generation_time(self, text: str) -> float:
+        return len(text.split()) / self.server.config.llm_tokens_per_second
+
+    # -- services ----------------------------------------------------------
+
+    def _tavily(self, body: dict) -> None:
+        cfg = self.server.config
+        time.sleep(cfg.tavily_latency)
+        query = body.get("query", "")
+        results = [
+            {
+                "url": f"https://example.com/{_seed(query) % 10007}/{i}",
+                "title": f"Result {i} for {query[:40]}",
+                "content": _prose(f"{query}:{i}", cfg.source_words),
+            }
+            for i in range(int(body.get("max_results", 3)))
+        ]
+        self._json({"query": query, "answer": None, "results": results})
+
+    def _fred(self, series_id: str) -> None:
+        # The full series, as fredgraph.csv returns it; the reader truncates to start/end
+        time.sleep(self.server.config.fred_latency)
+        index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=800, freq="D")
+        rng = np.random.default_rng(_seed(series_id))
+        values = [f"{v:.2f}" for v in 3 + np.cumsum(rng.normal(0, 0.01, size=len(index)))]
+        values[len(values) // 2] = "."  # FRED's marker for a missing observation
+        rows = [f"observation_date,{series_id}"]
+        rows += [f"{day:%Y-%m-%d},{value}" for day, value in zip(index, values)]
+        data = ("\n".join(rows) + "\n").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _openai(self, body: dict) -> None:
+        messages = body.get("messages", [])
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        user = next((m["content"] for m in messages if m["role"] == "user"), "")
+        text = self.server.respond(system, user)
+        usage = {"prompt_tokens": len((system + user).split()), "completion_tokens": len(text.split())}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        time.sleep(self.server.config.llm_latency)
+
+        base = {"id": "chatcmpl-bench", "created": int(time.time()), "model": body.get("model", "")}
+        if not body.get("stream"):
+            time.sleep(self._generation_time(text))
+            self._json({
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        self._start_sse()
+        for piece in self._chunks(text):
+            self._sse({
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            })
+        self._sse({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _anthropic(self, body: dict) -> None:
+        system = body.get("system") or ""
+        user = next((m["content"] for m in body.get("messages", []) if m["role"] == "user"), "")
+        if isinstance(user, list):
+            user = " ".join(block.get("text", "") for block in user)
+        text = self.server.respond(system, user)
+        in_tokens, out_tokens = len((system + user).split()), len(text.split())
+        time.sleep(self.server.config.llm_latency)
+
+        message = {
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", ""),
+            "stop_sequence": None,
+        }
+        if not body.get("stream"):
+            time.sleep(self._generation_time(text))
+            self._json({
+                **message,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": in_tokens, "output_tokens": out_tokens},
+            })
+            return
+
+        self._start_sse()
+        self._sse({"type": "message_start", "message": {
+            **message, "content": [], "stop_reason": None,
+            "usage": {"input_tokens": in_tokens, "output_tokens": 0},
+        }}, "message_start")
+        self._sse({"type": "content_block_start", "index": 0,
+                   "content_block": {"type": "text", "text": ""}}, "content_block_start")
+        for piece in self._chunks(text):
+            self._sse({"type": "content_block_delta", "index": 0,
+                       "delta": {"type": "text_delta", "text": piece}}, "content_block_delta")
+        self._sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        self._sse({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                   "usage": {"output_tokens": out_tokens}}, "message_delta")
+        self._sse({"type": "message_stop"}, "message_stop")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: FakeConfig):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.config = config
+        self.calls: Dict[str, int] = {}
+
+    def respond(self, system: str, user: str) -> str:
+        """Pick a plausible response for one of the pipeline's prompts."""
+        cfg = self.config
+        if "newsletterSections" in system:
+            sections = [
+                {"title": f"Section {i + 1}: {w.title()} Watch", "description": _prose(f"plan:{i}", 20)}
+                for i, w in enumerate(_WORDS[: cfg.sections])
+            ]
+            return json.dumps({"newsletterSections": sections})
+        if "subject" in system.lower():
+            return "Benchmark Weekly: Markets, Models And Momentum"
+        urls = [u for u in user.split() if u.startswith("https://")][:3]
+        links = " ".join(f'<a href="{u}">source</a>' for u in urls)
+        return f"<p>{_prose(user[:200], cfg.section_words)} {links}</p>"
+
+
+class FakeServices:
+    """
+    Run the fake Tavily/OpenAI/Anthropic server for the duration of a ``with`` block.
+
+    Inside the block ``tavily_endpoint`` is the URL to put in Settings, and
+    the OpenAI/Anthropic SDKs are redirected to the fake via their base-URL
+    environment variables.
+    """
+
+    def __init__(self, config: Optional[FakeConfig] = None):
+        self.config = config or FakeConfig()
+        self._server: Optional[_Server] = None
+        self._saved_env: Dict[str, Optional[str]] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def tavily_endpoint(self) -> str:
+        return f"{self.url}/search"
+
+    @property
+    def fred_url(self) -> str:
+        return f"{self.url}/fred/graph/fredgraph.csv"
+
+    @property
+    def calls(self) -> Dict[str, int]:
+        return dict(self._server.calls)
+
+    def __enter__(self) -> "FakeServices":
+        self._server = _Server(self.config)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        env = {"OPENAI_BASE_URL": f"{self.url}/v1", "ANTHROPIC_BASE_URL": self.url}
+        for key, value in env.items():
+            self._saved_env[key] = os.environ.get(key)
+            os.environ[key] = value
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def canned_history(ticker: str, days: int, end: Optional[datetime] = None) -> pd.DataFrame:
+    """Deterministic daily OHLCV random walk of ``days`` business days ending today."""
+    end = pd.Timestamp(end or datetime.now()).normalize()
+    index = pd.bdate_range(end=end, periods=days, tz="America/New_York", name="Date")
+    rng = np.random.default_rng(_seed(ticker))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=days)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.002, size=days)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 5_000_000, size=days),
+        },
+        index=index,
+    )
+
+
+def _days_for(period: Optional[str] = None, start=None) -> int:
+    if start is not None:
+        return max(1, int(np.busday_count(pd.Timestamp(start).date(), datetime.now().date())) + 1)
+    lookup = {"1d": 1, "5d": 5, "1mo": 22, "3mo": 64, "6mo": 126, "ytd": 200, "1y": 252, "2y": 504, "5y": 1260}
+    return lookup.get(period or "1mo", 2520)
+
+
+@contextmanager
+def canned_market_data(latency: float = 0.05, fred_url: Optional[str] = None) -> Iterator[None]:
+    """
+    Serve FinancialDataFetcher's Yahoo/FRED requests without the real services.
+
+    Yahoo requests return canned frames after sleeping ``latency`` seconds
+    (one batched download counts as one request), so batching and caching
+    still show up in timings. With ``fred_url`` (``FakeServices.fred_url``)
+    FRED series are downloaded from it by the real pandas-datareader reader;
+    otherwise they are canned too.
+    """
+    originals = {
+        name: getattr(FinancialDataFetcher, name)
+        for name in ("_fetch_history", "_download", "_fetch_fred", "__init__")
+    }
+    if fred_url:
+        try:
+            from pandas_datareader.fred import FredReader
+        except ImportError:
+            fred_url = None
+        else:
+            url_property = FredReader.url
+
+    def _init(self, *args, **kwargs):
+        originals["__init__"](self, *args, **kwargs)
+        # Canned Yahoo data doesn't need yfinance
+        self._yfinance_available = True
+        if not fred_url:
+            self._fred_available = True
+
+    def _fetch_history(self, ticker: str, period: Optional[str] = None, start=None, **kwargs) -> pd.DataFrame:
+        time.sleep(latency)
+        return canned_history(ticker, _days_for(period, start))
+
+    def _download(self, tickers: List[str], period: Optional[str] = None, start=None, **kwargs) -> Dict[str, pd.DataFrame]:
+        time.sleep(latency)
+        # yf.download returns daily bars without a timezone
+        return {t: canned_history(t, _days_for(period, start)).tz_localize(None) for t in tickers}
+
+    def _fetch_fred(self, series_id: str, start: datetime, end: datetime, timeout: float) -> pd.DataFrame:
+        time.sleep(latency)
+        index = pd.date_range(start=start, end=end, freq="D", name="DATE")
+        rng = np.random.default_rng(_seed(series_id))
+        values = 3 + np.cumsum(rng.normal(0, 0.01, size=len(index)))
+        return pd.DataFrame({series_id: values}, index=index)
+
+    FinancialDataFetcher.__init__ = _init
+    FinancialDataFetcher._fetch_history = _fetch_history
+    FinancialDataFetcher._download = _download
+    if fred_url:
+        FredReader.url = property(lambda self: fred_url)
+    else:
+        FinancialDataFetcher._fetch_fred = _fetch_fred
+    try:
+        yield
+    finally:
+        for name, fn in originals.items():
+            setattr(FinancialDataFetcher, name, fn)
+        if fred_url:
+            FredReader.url = url_property
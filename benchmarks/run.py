@@ -0,0 +1,271 @@
+"""
+Benchmark the newsletter pipeline against local fakes.
+
+    python -m benchmarks.run                      # full suite, results in benchmarks/results/
+    python -m benchmarks.run --quick -k chart     # fewer sizes/repeats, only chart benchmarks
+    python -m benchmarks.run --compare benchmarks/results/<earlier>.json
+
+No network access or API keys are needed: Tavily, the LLM providers and FRED
+are served by benchmarks.fakes.FakeServices, and Yahoo Finance data by canned
+frames (yfinance's own request/parsing code is not exercised).
+Each result file records the git commit, so runs can be compared across
+commits with ``--compare``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from newsletter.charts import CHART_FORMATS, ChartGenerator, embed_chart_in_html
+from newsletter.config import Settings
+from newsletter.models import FormInput, SectionDraft, SectionPlan
+from newsletter.pipeline import (
+    create_market_store,
+    draft_section,
+    generate_market_data_section,
+    render_html,
+    run_pipeline,
+)
+
+from .fakes import FakeConfig, FakeServices, canned_history, canned_market_data
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+FORM = FormInput(topic="AI and Machine Learning in Trading", tone="Professional", audience="Quantitative Researchers")
+
+
+def _settings(**overrides: Any) -> Settings:
+    # _env_file=None: benchmarks must not pick up a developer's .env (real keys, caches).
+    # Every persistent cache is off, so repeats measure the same work and a run
+    # writes nothing under ~/.cache.
+    options: Dict[str, Any] = {
+        "llm_cache_mode": "off",
+        "search_cache_path": None,
+        "market_cache_dir": None,
+        "chart_cache_entries": 0,
+        "chart_cache_path": None,
+        "template_cache_dir": None,
+    }
+    options.update(overrides)
+    return Settings(_env_file=None, **options)
+
+
+def _llm_settings(services: FakeServices, provider: str, **overrides: Any) -> Settings:
+    return _settings(
+        llm_provider=provider,
+        llm_model="claude-3-5-haiku-latest" if provider == "anthropic" else "gpt-4o-mini",
+        openai_api_key="bench",
+        anthropic_api_key="bench",
+        tavily_api_key="bench",
+        tavily_endpoint=services.tavily_endpoint,
+        **overrides,
+    )
+
+
+class Suite:
+    def __init__(self, repeat: int, warmup: int, pattern: Optional[str]):
+        self.repeat = repeat
+        self.warmup = warmup
+        self.pattern = pattern
+        self.results: List[Dict[str, Any]] = []
+
+    def bench(self, name: str, params: Dict[str, Any], fn: Callable[[], Any], repeat: Optional[int] = None) -> None:
+        label = f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+        if self.pattern and self.pattern not in label:
+            return
+        for _ in range(self.warmup):
+            fn()
+        runs = []
+        for _ in range(repeat or self.repeat):
+            gc.collect()
+            started = time.perf_counter()
+            fn()
+            runs.append(time.perf_counter() - started)
+        result = {
+            "name": name,
+            "params": params,
+            "label": label,
+            "runs": [round(r, 6) for r in runs],
+            "min": round(min(runs), 6),
+            "median": round(statistics.median(runs), 6),
+            "mean": round(statistics.fmean(runs), 6),
+        }
+        self.results.append(result)
+        print(f"{label:<60} median {result['median'] * 1000:9.1f} ms   min {result['min'] * 1000:9.1f} ms")
+
+
+def bench_charts(suite: Suite, lengths: List[int], ticker_counts: List[int]) -> None:
+    charts = ChartGenerator()
+    for days in lengths:
+        data = canned_history("SPY", days)
+        suite.bench("chart.price", {"points": days}, lambda: charts.create_price_chart(data))
+        suite.bench("chart.returns", {"points": days}, lambda: charts.create_returns_chart(data))
+        for n in ticker_counts:
+            frames = {f"T{i}": canned_history(f"T{i}", days) for i in range(n)}
+            suite.bench("chart.comparison", {"points": days, "tickers": n},
+                        lambda: charts.create_comparison_chart(frames))
+
+    data = canned_history("SPY", max(lengths))
+    for fmt in CHART_FORMATS:
+        formatted = ChartGenerator(format=fmt)
+        suite.bench("chart.format", {"format": fmt, "points": len(data)}, lambda: formatted.create_price_chart(data))
+
+
+def bench_render(suite: Suite, section_counts: List[int]) -> None:
+    settings = _settings()
+    chart = embed_chart_in_html(ChartGenerator().create_price_chart(canned_history("^VIX", 64)) or "")
+    for n in section_counts:
+        drafts = [
+            SectionDraft(
+                title=f"Section {i}",
+                html=f"<p>{'Lorem ipsum dolor sit amet. ' * 36}</p>",
+                sources=[f"https://example.com/{i}/{j}" for j in range(3)],
+            )
+            for i in range(n)
+        ]
+        drafts.insert(0, SectionDraft(title="Market Data & Indicators", html=f"<div>{chart}</div>", sources=[]))
+        suite.bench("render_html", {"sections": n}, lambda: render_html(settings, "Benchmark", drafts))
+
+
+def bench_market(suite: Suite, services: FakeServices, latency: float) -> None:
+    topics = {"tech": "AI in tech stocks", "crypto": "Bitcoin and crypto", "broad": "Global macro"}
+    with canned_market_data(latency=latency, fred_url=services.fred_url):
+        # Fetch failures are logged and skipped, so check the section is whole before timing it
+        settings = _settings()
+        html = generate_market_data_section(settings, FORM, create_market_store(settings)).html
+        for heading in ("Market Snapshot", "VIX Volatility", "Economic Indicators"):
+            if heading not in html:
+                raise RuntimeError(f"Market section is missing '{heading}'; see the log for the failed fetch")
+
+        for label, topic in topics.items():
+            form = FORM.model_copy(update={"topic": topic})
+            settings = _settings()
+            suite.bench("generate_market_data_section", {"topic": label, "fetch_latency": latency},
+                        lambda: generate_market_data_section(settings, form, create_market_store(settings)))
+
+
+def bench_llm(suite: Suite, services: FakeServices, providers: List[str], section_counts: List[int]) -> None:
+    section = SectionPlan(title="Factor Momentum", description="How factor momentum behaved this month")
+    for provider in providers:
+        settings = _llm_settings(services, provider)
+        suite.bench("draft_section", {"provider": provider, "stream": False},
+                    lambda: draft_section(settings, FORM, section))
+        suite.bench("draft_section", {"provider": provider, "stream": True},
+                    lambda: draft_section(settings, FORM, section, on_text=lambda text: None))
+
+        for n in section_counts:
+            services.config.sections = n
+            for concurrency in sorted({1, settings.max_concurrency}):
+                run_settings = _llm_settings(services, provider, max_concurrency=concurrency)
+                suite.bench("run_pipeline", {"provider": provider, "sections": n, "concurrency": concurrency},
+                            lambda: run_pipeline(run_settings, FORM))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        )
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str) -> None:
+    baseline = {r["label"]: r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    print(f"\nCompared with {baseline_path} (median):")
+    for r in current:
+        before = baseline.get(r["label"])
+        if before is None:
+            continue
+        change = (r["median"] - before["median"]) / before["median"] * 100 if before["median"] else 0.0
+        print(f"{r['label']:<60} {before['median'] * 1000:9.1f} -> {r['median'] * 1000:9.1f} ms  {change:+6.1f}%")
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark the newsletter pipeline against local fakes")
+    p.add_argument("--quick", action="store_true", help="Fewer sizes and repeats")
+    p.add_argument("-k", dest="pattern", help="Only run benchmarks whose label contains this text")
+    p.add_argument("--repeat", type=int, help="Timed runs per benchmark (default 5, 2 with --quick)")
+    p.add_argument("--providers", default="openai", help="Comma-separated LLM providers to benchmark (openai, anthropic)")
+    p.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM time to first token (s)")
+    p.add_argument("--tokens-per-second", type=float, default=400.0, help="Fake LLM generation speed")
+    p.add_argument("--tavily-latency", type=float, default=0.15, help="Fake Tavily latency (s)")
+    p.add_argument("--market-latency", type=float, default=0.05, help="Canned Yahoo / fake FRED request latency (s)")
+    p.add_argument("--output", help="Result file (default benchmarks/results/<timestamp>-<commit>.json)")
+    p.add_argument("--compare", metavar="RESULTS_JSON", help="Print median changes against an earlier result file")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    # Keep per-call warnings (e.g. max_words) out of the timing table
+    logging.basicConfig(level=logging.ERROR)
+    repeat = args.repeat or (2 if args.quick else 5)
+    sections = [3] if args.quick else [3, 6]
+    lengths = [60, 1000] if args.quick else [60, 250, 1000, 5000, 20000]
+    ticker_counts = [4] if args.quick else [2, 4, 8]
+    providers = [p.strip() for p in args.providers.split(",") if p.strip()]
+
+    suite = Suite(repeat=repeat, warmup=1, pattern=args.pattern)
+    bench_charts(suite, lengths, ticker_counts)
+    bench_render(suite, [3, 6, 12] if not args.quick else [6])
+
+    config = FakeConfig(
+        llm_latency=args.llm_latency,
+        llm_tokens_per_second=args.tokens_per_second,
+        tavily_latency=args.tavily_latency,
+        fred_latency=args.market_latency,
+    )
+    with FakeServices(config) as services:
+        bench_market(suite, services, args.market_latency)
+        with canned_market_data(latency=args.market_latency, fred_url=services.fred_url):
+            bench_llm(suite, services, providers, sections)
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {
+            "repeat": repeat,
+            "llm_latency": args.llm_latency,
+            "tokens_per_second": args.tokens_per_second,
+            "tavily_latency": args.tavily_latency,
+            "market_latency": args.market_latency,
+        },
+        "results": suite.results,
+    }
+    if args.output:
+        output = Path(args.output)
+    else:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{stamp}-{commit or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(suite.results, args.compare)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -4,6 +4,9 @@ __all__ = [
     "llm",
     "search",
     "pipeline",
+    "batch",
+    "profiling",
+    "metrics",
     "emailer",
 ]
 
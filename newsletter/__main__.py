@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import argparse
 import logging
-import os
+from contextlib import nullcontext
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -11,21 +11,104 @@ from .config import Settings
 from .models import FormInput
 from .pipeline import run_pipeline
 from .emailer import send_email
+from .batch import load_jobs, run_batch, write_outputs
+from .checkpoint import RunCheckpoint
+from .metrics import configure_metrics, write_metrics_textfile
+from .profiling import profile_run
 from .pipeline import plan_sections
 from .models import SectionPlan
 
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Generate and send a research-backed newsletter")
-    p.add_argument("--topic", required=True, help="Newsletter topic")
-    p.add_argument("--tone", required=True, help="Tone (e.g., Professional, Funny)")
-    p.add_argument("--audience", required=True, help="Target audience description")
+    p.add_argument("--topic", help="Newsletter topic")
+    p.add_argument("--tone", help="Tone (e.g., Professional, Funny)")
+    p.add_argument("--audience", help="Target audience description")
+    p.add_argument("--batch", metavar="JOBS_JSONL",
+                   help="Generate every job in a JSONL manifest (one {topic, tone, audience, id?, to?} per line)")
+    p.add_argument("--resume", metavar="RUN_ID",
+                   help="Resume a failed run from its checkpoints in <output-dir>/runs/RUN_ID")
+    p.add_argument("--keep-checkpoint", action="store_true",
+                   help="Keep <output-dir>/runs/RUN_ID after a successful run (removed by default)")
+    p.add_argument("--preview", action="store_true",
+                   help="Stream section drafts and keep a partial newsletter.html updated while drafting")
+    p.add_argument("--profile", action="store_true",
+                   help="Write a per-stage timing profile (profile.json) next to newsletter.html")
     p.add_argument("--to", nargs="*", help="Email recipients (optional)")
     p.add_argument("--send-email", action="store_true", help="Send via SMTP if configured")
     p.add_argument("--provider", choices=["openai", "anthropic"], help="LLM provider override")
     p.add_argument("--model", help="LLM model override")
     p.add_argument("--output-dir", help="Directory to write outputs")
-    return p.parse_args()
+    args = p.parse_args()
+    if not (args.batch or args.resume) and not (args.topic and args.tone and args.audience):
+        p.error("--topic, --tone and --audience are required unless --batch or --resume is given")
+    return args
+
+
+def _main_batch(settings: Settings, args: argparse.Namespace) -> None:
+    jobs = load_jobs(args.batch)
+    results, report = run_batch(settings, jobs)
+
+    for entry in report["jobs"]:
+        if entry["status"] == "ok":
+            print(f"[{entry['id']}] {entry['seconds']:.1f}s  {entry['subject']}")
+        else:
+            print(f"[{entry['id']}] {entry['seconds']:.1f}s  FAILED: {entry['error']}")
+    print(
+        f"Batch: {report['succeeded']}/{len(jobs)} succeeded in {report['total_seconds']:.1f}s; "
+        f"report at {Path(settings.output_dir) / 'batch_report.json'}"
+    )
+
+    if args.send_email:
+        for job in jobs:
+            recipients = job.to or args.to
+            if job.id in results and recipients:
+                newsletter = results[job.id]
+                send_email(settings, newsletter.subject, newsletter.html, recipients)
+                print(f"[{job.id}] Email sent to: {', '.join(recipients)}")
+
+
+def _main_single(settings: Settings, args: argparse.Namespace) -> None:
+    runs_root = str(Path(settings.output_dir) / "runs")
+    if args.resume:
+        checkpoint = RunCheckpoint.resume(runs_root, args.resume)
+        form = checkpoint.load_form()
+    else:
+        form = FormInput(topic=args.topic, tone=args.tone, audience=args.audience)
+        checkpoint = RunCheckpoint.create(runs_root, form)
+
+    out_dir = Path(settings.output_dir)
+    preview_path = None
+    if args.preview:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        preview_path = str(out_dir / "newsletter.html")
+        print(f"Writing preview to: {preview_path}")
+
+    # Run and also persist debug artifacts
+    profiler = profile_run("run", run_id=checkpoint.run_id) if settings.profile_run else nullcontext()
+    try:
+        with profiler as profile:
+            newsletter = run_pipeline(settings, form, checkpoint, preview_path=preview_path)
+    except Exception:
+        print(f"Run {checkpoint.run_id} failed; resume with: --resume {checkpoint.run_id}")
+        raise
+    finally:
+        if profile is not None:
+            for path in profile.write(str(out_dir / "profile.json"), chrome_trace=settings.profile_chrome_trace):
+                print(f"Wrote profile: {path}")
+
+    write_outputs(out_dir, newsletter)
+    if not args.keep_checkpoint:
+        checkpoint.discard()
+
+    print(f"Subject: {newsletter.subject}")
+    print(f"Wrote HTML: {out_dir / 'newsletter.html'}")
+
+    if args.send_email and args.to:
+        send_email(settings, newsletter.subject, newsletter.html, args.to)
+        print(f"Email sent to: {', '.join(args.to)}")
+    elif args.send_email:
+        print("--send-email provided but --to is empty; skipped sending.")
 
 
 def main() -> None:
@@ -39,27 +122,21 @@ def main() -> None:
         settings.llm_model = args.model
     if args.output_dir:
         settings.output_dir = args.output_dir
+    if args.profile:
+        settings.profile_run = True
     settings.validate_provider_keys()
 
     logging.basicConfig(level=getattr(logging, settings.log_level.upper(), logging.INFO))
+    configure_metrics(settings)
 
-    form = FormInput(topic=args.topic, tone=args.tone, audience=args.audience)
-    # Run and also persist debug artifacts
-    newsletter = run_pipeline(settings, form)
-
-    out_dir = Path(settings.output_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / "subject.txt").write_text(newsletter.subject, encoding="utf-8")
-    (out_dir / "newsletter.html").write_text(newsletter.html, encoding="utf-8")
-
-    print(f"Subject: {newsletter.subject}")
-    print(f"Wrote HTML: {out_dir / 'newsletter.html'}")
-
-    if args.send_email and args.to:
-        send_email(settings, newsletter.subject, newsletter.html, args.to)
-        print(f"Email sent to: {', '.join(args.to)}")
-    elif args.send_email:
-        print("--send-email provided but --to is empty; skipped sending.")
+    try:
+        if args.batch:
+            _main_batch(settings, args)
+        else:
+            _main_single(settings, args)
+    finally:
+        if settings.metrics_textfile:
+            write_metrics_textfile(settings.metrics_textfile)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import Settings
+from .models import BatchJob, Newsletter, SectionDraft
+from .profiling import profile_run
+from .search import get_search_cache
+from .pipeline import (
+    arun_pipeline,
+    create_market_store,
+    generate_market_data_section,
+    _extract_tickers_from_topic,
+    _get_chart_generator,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_jobs(path: str) -> List[BatchJob]:
+    """Read a JSONL manifest (one job object per line) and assign missing job ids."""
+    jobs: List[BatchJob] = []
+    dirs: Dict[str, Tuple[str, int]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = BatchJob(**json.loads(line))
+            except Exception as e:
+                raise ValueError(f"{path}:{lineno}: invalid job: {e}") from e
+            if not job.id:
+                job.id = f"job-{len(jobs) + 1:03d}"
+            # Jobs write to <output_dir>/<dirname>, so ids must not collide after sanitizing
+            dirname = _job_dirname(job.id)
+            if dirname in dirs:
+                other_id, other_line = dirs[dirname]
+                raise ValueError(
+                    f"{path}:{lineno}: job id {job.id!r} uses the same output directory {dirname!r} "
+                    f"as {other_id!r} on line {other_line}"
+                )
+            dirs[dirname] = (job.id, lineno)
+            jobs.append(job)
+    return jobs
+
+
+def _job_dirname(job_id: str) -> str:
+    """Directory name for a job id; ids with no usable characters get a hash-based name."""
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", job_id).strip("_")
+    if name in ("", ".", ".."):
+        return f"job-{hashlib.sha256(job_id.encode('utf-8')).hexdigest()[:12]}"
+    return name
+
+
+def write_outputs(out_dir: Path, newsletter: Newsletter) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "subject.txt").write_text(newsletter.subject, encoding="utf-8")
+    (out_dir / "newsletter.html").write_text(newsletter.html, encoding="utf-8")
+
+
+async def arun_batch(settings: Settings, jobs: List[BatchJob]) -> Tuple[Dict[str, Newsletter], Dict[str, Any]]:
+    """Generate every job on one event loop.
+
+    Jobs share the LLM/HTTP client pools and the search cache, and jobs whose
+    topics map to the same tickers share a single market data section. All
+    market data comes from one MarketDataStore, so each ticker is downloaded once.
+    Returns the newsletters by job id and a report with per-job timings. With
+    PROFILE_RUN, each job's span profile is written to its output directory.
+    """
+    limit = asyncio.Semaphore(max(1, settings.batch_concurrency))
+    market_tasks: Dict[tuple, "asyncio.Task[Optional[SectionDraft]]"] = {}
+    store = create_market_store(settings)
+
+    async def _fetch_market(job: BatchJob) -> Optional[SectionDraft]:
+        try:
+            return await asyncio.to_thread(generate_market_data_section, settings, job, store)
+        except Exception as e:
+            logger.warning(f"Failed to generate market data section: {e}")
+            return None
+
+    def _market_for(job: BatchJob) -> "asyncio.Task[Optional[SectionDraft]]":
+        key = tuple(_extract_tickers_from_topic(job.topic))
+        if key not in market_tasks:
+            market_tasks[key] = asyncio.create_task(_fetch_market(job))
+        return market_tasks[key]
+
+    results: Dict[str, Newsletter] = {}
+    report: Dict[str, Any] = {"jobs": []}
+
+    async def _run(job: BatchJob) -> None:
+        async with limit:
+            started = time.perf_counter()
+            entry: Dict[str, Any] = {"id": job.id, "topic": job.topic, "audience": job.audience}
+            profiler = profile_run("job", job_id=job.id) if settings.profile_run else nullcontext()
+            with profiler as profile:
+                try:
+                    job_settings, market_section = settings, None
+                    if settings.enable_market_data:
+                        market_section = await _market_for(job)
+                        if market_section is None:
+                            # Shared fetch already failed; don't retry it per job
+                            job_settings = settings.model_copy(update={"enable_market_data": False})
+                    results[job.id] = await arun_pipeline(job_settings, job, market_section=market_section)
+                    entry["status"] = "ok"
+                    entry["subject"] = results[job.id].subject
+                except Exception as e:
+                    logger.error(f"Batch job {job.id} failed: {e}")
+                    entry["status"] = "error"
+                    entry["error"] = str(e)
+            entry["seconds"] = round(time.perf_counter() - started, 3)
+            if profile is not None:
+                path = Path(settings.output_dir) / _job_dirname(job.id) / "profile.json"
+                profile.write(str(path), chrome_trace=settings.profile_chrome_trace)
+                entry["profile"] = str(path)
+            report["jobs"].append(entry)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_run(job) for job in jobs))
+    order = {job.id: i for i, job in enumerate(jobs)}
+    report["jobs"].sort(key=lambda e: order[e["id"]])
+    report["total_seconds"] = round(time.perf_counter() - started, 3)
+    report["succeeded"] = sum(1 for e in report["jobs"] if e["status"] == "ok")
+    report["failed"] = len(jobs) - report["succeeded"]
+    search_cache = get_search_cache(settings)
+    if search_cache is not None:
+        report["search_cache"] = search_cache.stats()
+    chart_cache = _get_chart_generator(settings).cache
+    if settings.enable_market_data and chart_cache is not None:
+        report["chart_cache"] = chart_cache.stats()
+    return results, report
+
+
+def run_batch(settings: Settings, jobs: List[BatchJob]) -> Tuple[Dict[str, Newsletter], Dict[str, Any]]:
+    """Run all jobs, write each to ``<output_dir>/<job id>/`` and a ``batch_report.json``."""
+    results, report = asyncio.run(arun_batch(settings, jobs))
+
+    root = Path(settings.output_dir)
+    for entry in report["jobs"]:
+        newsletter = results.get(entry["id"])
+        if newsletter is None:
+            continue
+        out_dir = root / _job_dirname(entry["id"])
+        write_outputs(out_dir, newsletter)
+        entry["output_dir"] = str(out_dir)
+
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "batch_report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return results, report
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Shared instances by (absolute database path, ttl, max_entries), see open_cache()
+_instances: Dict[Tuple[str, float, int], "SQLiteCache"] = {}
+_instances_lock = threading.Lock()
+
+# Writes between full sweeps (expired rows, recount); other connections to the
+# same file can add rows this instance hasn't counted
+_SWEEP_EVERY = 256
+
+
+class SQLiteCache:
+    """
+    SQLite-backed key/value cache for search and LLM responses.
+
+    One database file holds every entry, keyed by a request hash. Entries
+    expire after ``ttl`` seconds, and once the table grows past
+    ``max_entries`` the least recently used entries are evicted. The row count
+    is tracked in memory and re-read from the table every ``_SWEEP_EVERY``
+    writes, when expired entries are also swept. Hit, miss and eviction counts
+    are kept per instance for reporting.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400, max_entries: int = 5000):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            (self._count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._count -= self._conn.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            exists = self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if exists is None:
+                self._count += 1
+            self._writes += 1
+            if self._writes >= _SWEEP_EVERY:
+                self._sweep(now)
+            elif self._count > self.max_entries:
+                self._evict_lru()
+
+    def _sweep(self, now: float) -> None:
+        expired = self._conn.execute(
+            "DELETE FROM entries WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+        self.evictions += expired
+        (self._count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        self._writes = 0
+        self._evict_lru()
+
+    def _evict_lru(self) -> None:
+        overflow = self._count - self.max_entries
+        if overflow > 0:
+            deleted = self._conn.execute(
+                "DELETE FROM entries WHERE key IN"
+                " (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            ).rowcount
+            self._count -= deleted
+            self.evictions += deleted
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._count = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def open_cache(path: str, ttl: float, max_entries: int) -> SQLiteCache:
+    """Process-wide SQLiteCache for ``path`` with these limits, created on first use.
+
+    Callers that open the same file with a different ``ttl`` or ``max_entries``
+    get their own instance (and connection), so each keeps the limits it asked for.
+    """
+    key = (os.path.abspath(os.path.expanduser(path)), ttl, max_entries)
+    with _instances_lock:
+        cache = _instances.get(key)
+        if cache is None:
+            cache = SQLiteCache(key[0], ttl=ttl, max_entries=max_entries)
+            _instances[key] = cache
+        return cache
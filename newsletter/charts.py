@@ -1,37 +1,625 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import io
+import json
 import logging
-from typing import Optional
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 
+from .cache import SQLiteCache
+from .config import Settings
+from .profiling import annotate, profiled, span
+
 logger = logging.getLogger(__name__)
 
+# Part of every chart cache key; bump when render_chart's drawing changes.
+_CACHE_VERSION = "v2"
 
-class ChartGenerator:
-    """Generates embedded charts for HTML newsletters."""
+# forkserver avoids forking a process that already runs threads (the pipeline's pools)
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# How charts are referenced from the HTML; see ChartImageStore
+IMAGE_MODES = ("inline", "file", "cid")
+
+# Right-hand side of chart Content-IDs: <img src="cid:<file name>@newsletter">
+CID_DOMAIN = "newsletter"
+
+# Output formats. png8 is a palette-quantized, optimized PNG: a quarter of the
+# size for flat-colored charts, and unlike WebP and SVG shown by every mail client.
+CHART_FORMATS = ("png", "png8", "webp", "svg")
+_EXTENSIONS = {"png": "png", "png8": "png", "webp": "webp", "svg": "svg"}
+_MIME_TYPES = {"png": "image/png", "webp": "image/webp", "svg": "image/svg+xml"}
+
+_PALETTE_COLORS = 64
+_WEBP_QUALITY = 85
+# SVG only: merge line vertices that deviate less than this many pixels from a straight path
+_SVG_SIMPLIFY_THRESHOLD = 1.0
+# Lowest resolution a byte budget may scale a raster chart down to
+_MIN_DPI = 50
+# Line charts keep up to 4 points per column; see decimate_line
+_DECIMATE_COLUMNS_PER_PIXEL = 2
+
+
+@dataclass
+class ChartSeries:
+    """One plotted series: x values (dates or numbers) and y values."""
+
+    y: np.ndarray
+    x: Optional[np.ndarray] = None
+    label: Optional[str] = None
+    color: Optional[str] = None
+
+
+@dataclass
+class ChartSpec:
+    """
+    Everything needed to draw a chart, as plain arrays and options.
+
+    Specs are picklable, so they can be rendered in another process.
+
+    Attributes:
+        kind: "line" (one line per series) or "hist" (histogram of the first series)
+        series: Data to plot
+        title: Chart title
+        xlabel: X axis label
+        ylabel: Y axis label
+        figsize: Figure size in inches (width, height)
+        dpi: Output resolution (raster formats)
+        format: Output format, one of CHART_FORMATS
+        legend: Whether to draw a legend
+        bins: Histogram bins
+        mean_line: Histogram only; mark the mean with a dashed line
+        date_axis: Rotate x tick labels for dates
+    """
+
+    kind: str
+    series: List[ChartSeries] = field(default_factory=list)
+    title: str = ""
+    xlabel: str = ""
+    ylabel: str = ""
+    figsize: Tuple[float, float] = (10, 6)
+    dpi: int = 100
+    format: str = "png"
+    legend: bool = False
+    bins: int = 50
+    mean_line: bool = False
+    date_axis: bool = False
+
+
+def chart_key(spec: ChartSpec) -> str:
+    """
+    Content hash of a chart spec: the data arrays plus every option that affects the image.
+
+    Identical charts (same series, title, figsize, style, ...) get the same
+    key however they were produced. The matplotlib version is included since
+    it changes the rendered pixels.
+    """
+    import matplotlib
+
+    options = {
+        "version": _CACHE_VERSION,
+        "matplotlib": matplotlib.__version__,
+        "kind": spec.kind,
+        "title": spec.title,
+        "xlabel": spec.xlabel,
+        "ylabel": spec.ylabel,
+        "figsize": list(spec.figsize),
+        "dpi": spec.dpi,
+        "format": spec.format,
+        "legend": spec.legend,
+        "bins": spec.bins,
+        "mean_line": spec.mean_line,
+        "date_axis": spec.date_axis,
+        "series": [
+            {
+                "label": s.label,
+                "color": s.color,
+                "y": [str(np.asarray(s.y).dtype), len(s.y)],
+                "x": None if s.x is None else [str(np.asarray(s.x).dtype), len(s.x)],
+            }
+            for s in spec.series
+        ],
+    }
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8"))
+    for s in spec.series:
+        for values in (s.y, s.x):
+            if values is None:
+                continue
+            values = np.asarray(values)
+            if values.dtype == object:
+                digest.update(repr(values.tolist()).encode("utf-8"))
+            else:
+                digest.update(np.ascontiguousarray(values).tobytes())
+    return f"chart:{_CACHE_VERSION}:{digest.hexdigest()}"
+
+
+class ChartCache:
+    """
+    Rendered chart images by content hash (see chart_key).
+
+    Recently used images are kept in memory (LRU, ``max_entries``); with a
+    ``disk`` SQLiteCache they also survive across processes until its TTL, so
+    the same chart in many issues of the day is rendered once.
+    """
+
+    def __init__(self, max_entries: int = 128, disk: Optional[SQLiteCache] = None):
+        self.max_entries = max_entries
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+
+        if self.disk is not None:
+            try:
+                cached = self.disk.get(key)
+            except Exception as e:
+                logger.warning(f"Chart cache read failed: {e}")
+                cached = None
+            if cached is not None:
+                image = base64.b64decode(cached)
+                self._remember(key, image)
+                with self._lock:
+                    self.hits += 1
+                return image
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, image: bytes) -> None:
+        self._remember(key, image)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, base64.b64encode(image).decode("ascii"))
+            except Exception as e:
+                logger.warning(f"Chart cache write failed: {e}")
+
+    def _remember(self, key: str, image: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def data_uri(image: bytes, fmt: str = "png") -> str:
+    """Encode image bytes (in one of CHART_FORMATS) as a base64 data URI."""
+    img_base64 = base64.b64encode(image).decode('utf-8')
+    return f"data:{_MIME_TYPES[_EXTENSIONS[fmt]]};base64,{img_base64}"
+
+
+class ChartImageStore:
+    """
+    Turns rendered chart images into ``<img src>`` references.
+
+    Modes:
+        inline: base64 data URI, so the HTML is self-contained (images grow by a third)
+        file: written once to ``directory`` as ``<content hash>.<ext>`` and referenced as
+            ``url_prefix`` + file name; upload or serve the directory at that prefix
+        cid: written the same way and referenced as ``cid:<file name>@newsletter``;
+            emailer.send_email attaches the files as related MIME parts
+
+    If an image cannot be written it is embedded inline instead.
+    """
+
+    def __init__(self, mode: str = "inline", directory: Optional[str] = None, url_prefix: Optional[str] = None):
+        if mode not in IMAGE_MODES:
+            raise ValueError(f"Unsupported chart image mode: {mode}")
+        if mode != "inline" and not directory:
+            raise ValueError(f"Chart image mode '{mode}' needs an image directory")
+        self.mode = mode
+        self.directory = Path(directory).expanduser() if directory else None
+        if not url_prefix and self.directory is not None:
+            url_prefix = self.directory.resolve().as_uri()
+        if url_prefix and not url_prefix.endswith("/"):
+            url_prefix += "/"
+        self.url_prefix = url_prefix or ""
+
+    def reference(self, image: bytes, fmt: str = "png") -> str:
+        """Store ``image`` as configured and return the URL to put in ``<img src>``."""
+        if self.mode != "inline":
+            try:
+                name = self.write(image, fmt)
+            except OSError as e:
+                logger.warning(f"Failed to write chart image, embedding it inline: {e}")
+            else:
+                if self.mode == "cid":
+                    return f"cid:{name}@{CID_DOMAIN}"
+                return f"{self.url_prefix}{name}"
+        return data_uri(image, fmt)
+
+    def write(self, image: bytes, fmt: str = "png") -> str:
+        """Write ``image`` under its content hash unless it already exists; returns the file name."""
+        name = f"{hashlib.sha256(image).hexdigest()[:32]}.{_EXTENSIONS[fmt]}"
+        path = self.directory / name
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(image)
+            os.replace(tmp, path)
+        return name
+
+
+def chart_image_dir(settings: Settings) -> str:
+    """Directory file/cid chart images are written to."""
+    return settings.chart_image_dir or os.path.join(settings.output_dir, "charts")
+
+
+class _RcGuard:
+    """
+    Shared/exclusive lock around in-process renders.
+
+    matplotlib reads rcParams while drawing, and the SVG options can only be
+    set there, process-wide. Raster renders share the guard; an SVG render
+    takes it exclusively, so its settings neither leak into concurrent renders
+    nor get interleaved with another SVG render's. Waiting SVG renders go first.
+    """
 
     def __init__(self):
+        self._cond = threading.Condition()
+        self._sharing = 0
+        self._exclusive = False
+        self._waiting = 0
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._exclusive and not self._waiting)
+            self._sharing += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._sharing -= 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        with self._cond:
+            self._waiting += 1
+            self._cond.wait_for(lambda: not self._exclusive and not self._sharing)
+            self._waiting -= 1
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive = False
+                self._cond.notify_all()
+
+
+_rc_guard = _RcGuard()
+
+
+def render_chart(spec: ChartSpec) -> bytes:
+    """
+    Render a chart spec to image bytes in ``spec.format``.
+
+    Uses matplotlib's object-oriented ``Figure`` API rather than ``pyplot``,
+    so there is no global figure state and calls are safe from any thread or
+    process. SVG renders change rcParams for their duration and run alone
+    (see _RcGuard); other renders run concurrently.
+
+    Args:
+        spec: Chart to draw
+
+    Returns:
+        Image bytes (PNG, WebP or SVG)
+    """
+    if spec.format not in CHART_FORMATS:
+        raise ValueError(f"Unsupported chart format: {spec.format}")
+
+    if spec.format != "svg":
+        with _rc_guard.shared():
+            return _render_raster(spec)
+
+    from matplotlib import rc_context
+
+    # Simplify long lines to the vertices that are visible, keep text as <text>
+    # rather than glyph outlines, and leave out anything (date, random ids) that
+    # would make identical specs render different bytes
+    rc = {
+        "path.simplify": True,
+        "path.simplify_threshold": _SVG_SIMPLIFY_THRESHOLD,
+        "svg.fonttype": "none",
+        "svg.hashsalt": _CACHE_VERSION,
+    }
+    with _rc_guard.exclusive(), rc_context(rc):
+        fig = _draw(spec)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='svg', bbox_inches='tight', metadata={'Date': None})
+    return buf.getvalue()
+
+
+def _render_raster(spec: ChartSpec) -> bytes:
+    fig = _draw(spec)
+    buf = io.BytesIO()
+    if spec.format == "webp":
+        fig.savefig(buf, format='webp', dpi=spec.dpi, bbox_inches='tight', pil_kwargs={'quality': _WEBP_QUALITY})
+        return buf.getvalue()
+
+    fig.savefig(buf, format='png', dpi=spec.dpi, bbox_inches='tight')
+    if spec.format == "png8":
+        return _quantize_png(buf.getvalue())
+    return buf.getvalue()
+
+
+def _quantize_png(png: bytes) -> bytes:
+    """Reduce a PNG to a small palette and re-encode it with maximum compression."""
+    from PIL import Image  # a matplotlib dependency
+
+    image = Image.open(io.BytesIO(png)).convert("RGB")
+    buf = io.BytesIO()
+    image.quantize(colors=_PALETTE_COLORS, method=Image.Quantize.FASTOCTREE).save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def _draw(spec: ChartSpec):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.figsize)
+    ax = fig.subplots()
+
+    if spec.kind == "line":
+        for s in spec.series:
+            x = s.x if s.x is not None else np.arange(len(s.y))
+            ax.plot(x, s.y, linewidth=2, color=s.color, label=s.label)
+    elif spec.kind == "hist":
+        values = spec.series[0].y
+        ax.hist(values, bins=spec.bins, alpha=0.7, color=spec.series[0].color, edgecolor='black')
+        if spec.mean_line:
+            mean = float(np.mean(values))
+            ax.axvline(mean, color='red', linestyle='--', linewidth=2, label=f'Mean: {mean:.2%}')
+    else:
+        raise ValueError(f"Unsupported chart kind: {spec.kind}")
+
+    ax.set_title(spec.title, fontsize=14, fontweight='bold')
+    ax.set_xlabel(spec.xlabel, fontsize=11)
+    ax.set_ylabel(spec.ylabel, fontsize=11)
+    if spec.legend:
+        ax.legend(loc='best')
+    ax.grid(True, alpha=0.3)
+
+    if spec.date_axis:
+        fig.autofmt_xdate()
+    fig.tight_layout()
+
+    return fig
+
+
+def _warm_worker() -> None:
+    # Pay matplotlib's import and font-cache cost once per worker, not per chart
+    import matplotlib.figure  # noqa: F401
+    from matplotlib.backends import backend_agg  # noqa: F401
+
+
+def _ping() -> None:
+    pass
+
+
+class ChartRenderer:
+    """
+    Renders ChartSpecs to image bytes, in the calling thread or a warm process pool.
+
+    With ``workers`` > 0, charts render in that many worker processes, so
+    several charts (from one market section or many batch jobs) rasterize in
+    parallel across cores. A broken pool falls back to rendering in-process.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(_START_METHOD),
+                    initializer=_warm_worker,
+                )
+            return self._pool
+
+    def warm(self) -> None:
+        """Start every worker process now instead of on the first charts."""
+        pool = self._get_pool()
+        if pool is not None:
+            for future in [pool.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+
+    def submit(self, spec: ChartSpec) -> "Future[bytes]":
+        """Start rendering ``spec``; without a pool it is rendered before returning."""
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return pool.submit(render_chart, spec)
+            except BrokenProcessPool as e:
+                self._fall_back(e)
+
+        future: "Future[bytes]" = Future()
+        try:
+            future.set_result(render_chart(spec))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def result(self, future: "Future[bytes]", spec: ChartSpec) -> bytes:
+        """Wait for a submitted render, re-rendering ``spec`` in-process if the pool broke under it."""
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            self._fall_back(e)
+            return render_chart(spec)
+
+    def render(self, spec: ChartSpec) -> bytes:
+        return self.result(self.submit(spec), spec)
+
+    def _fall_back(self, error: Exception) -> None:
+        logger.warning(f"Chart process pool failed, rendering in-process: {error}")
+        self.shutdown()
+        self.workers = 0
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+_renderers: Dict[int, ChartRenderer] = {}
+_renderers_lock = threading.Lock()
+
+
+def get_chart_renderer(workers: int = 0) -> ChartRenderer:
+    """Process-wide renderer for a worker count, so its pool stays warm across runs."""
+    with _renderers_lock:
+        if workers not in _renderers:
+            _renderers[workers] = ChartRenderer(workers)
+        return _renderers[workers]
+
+
+def _x_values(index: pd.Index) -> np.ndarray:
+    # Plot timezone-aware dates at their local wall-clock time, as pandas would
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy()
+
+
+def decimate_line(x: np.ndarray, y: np.ndarray, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a line series to the points that can show at ``buckets`` pixels wide.
+
+    Splits the x range into ``buckets`` equal-width columns and keeps the
+    first, last, lowest and highest point of each (min/max per pixel, "M4"),
+    so in every column the decimated line spans the same values as the full
+    series while plotting at most ``4 * buckets`` points. NaN points (gaps)
+    are kept.
+
+    Args:
+        x: X values (dates or numbers), ascending
+        y: Y values
+        buckets: Number of columns, at least the plot width in pixels
+
+    Returns:
+        (x, y) with the kept points, or the inputs if they are already small enough
+    """
+    n = len(y)
+    if buckets <= 0 or n <= 4 * buckets:
+        return x, y
+
+    if np.issubdtype(x.dtype, np.datetime64):
+        position = x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    elif np.issubdtype(x.dtype, np.number):
+        position = x.astype(float)
+    else:
+        position = np.arange(n, dtype=float)
+    if not np.all(np.diff(position) >= 0):
+        position = np.arange(n, dtype=float)
+
+    edges = np.linspace(position[0], position[-1], buckets + 1)[1:-1]
+    column = np.searchsorted(edges, position, side="right")
+    starts = np.flatnonzero(np.diff(column, prepend=-1))
+    ends = np.append(starts[1:], n) - 1
+
+    values = np.asarray(y, dtype=float)
+    missing = np.isnan(values)
+    # Sort by column, then value: the first point of each column's run is its
+    # minimum and the last its maximum (NaNs excluded from both)
+    lowest = np.lexsort((np.where(missing, np.inf, values), column))[starts]
+    highest = np.lexsort((np.where(missing, -np.inf, values), column))[ends]
+
+    keep = np.unique(np.concatenate([starts, ends, lowest, highest, np.flatnonzero(missing)]))
+    return x[keep], y[keep]
+
+
+def _budget_candidates(fmt: str, dpi: int) -> Iterator[Tuple[str, int]]:
+    """Smaller (format, dpi) alternatives to try, in order, for a chart over its byte budget."""
+    if fmt in ("png", "svg"):
+        fmt = "png8"
+        yield fmt, dpi
+    while dpi > _MIN_DPI:
+        dpi = max(_MIN_DPI, int(dpi * 0.8))
+        yield fmt, dpi
+
+
+class ChartGenerator:
+    """
+    Generates embedded charts for HTML newsletters.
+
+    Charts are drawn in ``format`` at ``dpi``. With ``max_bytes`` set, a chart
+    over that size is re-rendered as an optimized PNG (png8) and then at lower
+    resolutions until it fits; the chosen format, dpi and size are recorded on
+    the chart's profiling span.
+    """
+
+    def __init__(
+        self,
+        renderer: Optional[ChartRenderer] = None,
+        cache: Optional[ChartCache] = None,
+        images: Optional[ChartImageStore] = None,
+        format: str = "png",
+        dpi: int = 100,
+        max_bytes: int = 0,
+    ):
+        if format not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format: {format}")
         self._matplotlib_available = False
+        self.renderer = renderer or get_chart_renderer()
+        self.cache = cache
+        self.images = images or ChartImageStore()
+        self.format = format
+        self.dpi = dpi
+        self.max_bytes = max_bytes
 
         try:
-            import matplotlib
-            matplotlib.use('Agg')  # Non-interactive backend
-            import matplotlib.pyplot as plt
-            self.plt = plt
+            import matplotlib  # noqa: F401
             self._matplotlib_available = True
         except ImportError:
             logger.warning("matplotlib not installed - chart generation will be unavailable")
 
-    def create_price_chart(
+    def price_chart_spec(
         self,
         data: pd.DataFrame,
         title: str = "Price Chart",
         figsize: tuple = (10, 6)
-    ) -> Optional[str]:
+    ) -> Optional[ChartSpec]:
         """
-        Create a line chart from price data and return as base64 embedded image.
+        Build the spec for a closing-price line chart.
 
         Args:
             data: DataFrame with price data (must have 'Close' column)
@@ -39,50 +627,32 @@ class ChartGenerator:
             figsize: Figure size (width, height)
 
         Returns:
-            Base64-encoded PNG image string for HTML embedding, or None if fails
+            ChartSpec, or None if there is no data
         """
-        if not self._matplotlib_available:
-            logger.error("matplotlib not available")
-            return None
-
         if data is None or data.empty:
             logger.warning("No data provided for chart")
             return None
 
-        try:
-            fig, ax = self.plt.subplots(figsize=figsize)
-
-            # Plot closing price
-            ax.plot(data.index, data['Close'], linewidth=2, color='#1f77b4')
-            ax.set_title(title, fontsize=14, fontweight='bold')
-            ax.set_xlabel('Date', fontsize=11)
-            ax.set_ylabel('Price ($)', fontsize=11)
-            ax.grid(True, alpha=0.3)
-
-            # Format x-axis dates
-            fig.autofmt_xdate()
-
-            # Tight layout
-            self.plt.tight_layout()
-
-            # Convert to base64
-            img_data = self._fig_to_base64(fig)
-            self.plt.close(fig)
-
-            return img_data
-
-        except Exception as e:
-            logger.error(f"Failed to create price chart: {e}")
-            return None
-
-    def create_comparison_chart(
+        return ChartSpec(
+            kind="line",
+            series=[self._line_series(_x_values(data.index), data['Close'].to_numpy(), figsize, color='#1f77b4')],
+            title=title,
+            xlabel='Date',
+            ylabel='Price ($)',
+            figsize=figsize,
+            dpi=self.dpi,
+            format=self.format,
+            date_axis=True,
+        )
+
+    def comparison_chart_spec(
         self,
         data_dict: dict[str, pd.DataFrame],
         title: str = "Comparison Chart",
         figsize: tuple = (10, 6)
-    ) -> Optional[str]:
+    ) -> Optional[ChartSpec]:
         """
-        Create a multi-line comparison chart.
+        Build the spec for a comparison chart of series normalized to start at 100.
 
         Args:
             data_dict: Dict mapping labels to DataFrames (each with 'Close' column)
@@ -90,43 +660,110 @@ class ChartGenerator:
             figsize: Figure size
 
         Returns:
-            Base64-encoded PNG image string or None if fails
+            ChartSpec, or None if there is no data
         """
-        if not self._matplotlib_available:
-            logger.error("matplotlib not available")
-            return None
-
         if not data_dict:
             logger.warning("No data provided for comparison chart")
             return None
 
-        try:
-            fig, ax = self.plt.subplots(figsize=figsize)
+        series = []
+        for label, data in data_dict.items():
+            if data is not None and not data.empty:
+                # Normalize each series to start at 100 for easier comparison
+                normalized = (data['Close'] / data['Close'].iloc[0]) * 100
+                series.append(self._line_series(_x_values(normalized.index), normalized.to_numpy(), figsize, label=label))
+
+        return ChartSpec(
+            kind="line",
+            series=series,
+            title=title,
+            xlabel='Date',
+            ylabel='Normalized Price (Base=100)',
+            figsize=figsize,
+            dpi=self.dpi,
+            format=self.format,
+            legend=True,
+            date_axis=True,
+        )
+
+    def returns_chart_spec(
+        self,
+        data: pd.DataFrame,
+        title: str = "Returns Distribution",
+        figsize: tuple = (10, 6)
+    ) -> Optional[ChartSpec]:
+        """
+        Build the spec for a histogram of daily returns.
 
-            # Normalize each series to start at 100 for easier comparison
-            for label, data in data_dict.items():
-                if data is not None and not data.empty:
-                    normalized = (data['Close'] / data['Close'].iloc[0]) * 100
-                    ax.plot(normalized.index, normalized, linewidth=2, label=label)
+        Args:
+            data: DataFrame with price data (must have 'Close' column)
+            title: Chart title
+            figsize: Figure size
+
+        Returns:
+            ChartSpec, or None if there is no data
+        """
+        if data is None or data.empty:
+            logger.warning("No data provided for returns chart")
+            return None
+
+        # Calculate daily returns
+        returns = data['Close'].pct_change().dropna()
+
+        return ChartSpec(
+            kind="hist",
+            series=[ChartSeries(y=returns.to_numpy(), color='#2ca02c')],
+            title=title,
+            xlabel='Daily Return (%)',
+            ylabel='Frequency',
+            figsize=figsize,
+            dpi=self.dpi,
+            format=self.format,
+            legend=True,
+            mean_line=True,
+        )
+
+    @profiled("chart.price")
+    def create_price_chart(
+        self,
+        data: pd.DataFrame,
+        title: str = "Price Chart",
+        figsize: tuple = (10, 6)
+    ) -> Optional[str]:
+        """
+        Create a line chart from price data and return a reference for embedding.
 
-            ax.set_title(title, fontsize=14, fontweight='bold')
-            ax.set_xlabel('Date', fontsize=11)
-            ax.set_ylabel('Normalized Price (Base=100)', fontsize=11)
-            ax.legend(loc='best')
-            ax.grid(True, alpha=0.3)
+        Args:
+            data: DataFrame with price data (must have 'Close' column)
+            title: Chart title
+            figsize: Figure size (width, height)
 
-            fig.autofmt_xdate()
-            self.plt.tight_layout()
+        Returns:
+            Image URL for an ``<img src>`` (see ChartImageStore), or None if fails
+        """
+        return self._create("price", lambda: self.price_chart_spec(data, title, figsize))
 
-            img_data = self._fig_to_base64(fig)
-            self.plt.close(fig)
+    @profiled("chart.comparison")
+    def create_comparison_chart(
+        self,
+        data_dict: dict[str, pd.DataFrame],
+        title: str = "Comparison Chart",
+        figsize: tuple = (10, 6)
+    ) -> Optional[str]:
+        """
+        Create a multi-line comparison chart.
 
-            return img_data
+        Args:
+            data_dict: Dict mapping labels to DataFrames (each with 'Close' column)
+            title: Chart title
+            figsize: Figure size
 
-        except Exception as e:
-            logger.error(f"Failed to create comparison chart: {e}")
-            return None
+        Returns:
+            Image URL for an ``<img src>`` or None if fails
+        """
+        return self._create("comparison", lambda: self.comparison_chart_spec(data_dict, title, figsize))
 
+    @profiled("chart.returns")
     def create_returns_chart(
         self,
         data: pd.DataFrame,
@@ -142,49 +779,115 @@ class ChartGenerator:
             figsize: Figure size
 
         Returns:
-            Base64-encoded PNG image string or None if fails
+            Image URL for an ``<img src>`` or None if fails
+        """
+        return self._create("returns", lambda: self.returns_chart_spec(data, title, figsize))
+
+    def render_charts(self, specs: Sequence[Optional[ChartSpec]]) -> List[Optional[str]]:
+        """
+        Render several charts at once (in parallel when the renderer has workers).
+
+        Args:
+            specs: Chart specs, e.g. from ``price_chart_spec``; None entries are skipped
+
+        Returns:
+            Image URLs in the same order, None where a chart failed
         """
         if not self._matplotlib_available:
             logger.error("matplotlib not available")
-            return None
-
-        if data is None or data.empty:
-            logger.warning("No data provided for returns chart")
+            return [None] * len(specs)
+
+        with span("chart.batch", charts=len(specs)) as attrs:
+            submitted = [self._submit(spec) if spec is not None else None for spec in specs]
+            images: List[Optional[str]] = []
+            for spec, pending in zip(specs, submitted):
+                if pending is None:
+                    images.append(None)
+                    continue
+                try:
+                    image, spec, _ = self._fit(spec, self.renderer.result(pending[0], spec), pending[1])
+                except Exception as e:
+                    logger.error(f"Failed to render chart '{spec.title}': {e}")
+                    images.append(None)
+                    continue
+                attrs["bytes"] = attrs.get("bytes", 0) + len(image)
+                images.append(self.images.reference(image, spec.format))
+            return images
+
+    def _line_series(self, x: np.ndarray, y: np.ndarray, figsize: tuple, **style) -> ChartSeries:
+        # Points beyond a few per pixel only cost render time and memory. The axes'
+        # pixel grid isn't known before layout, so use two columns per pixel of
+        # figure width to keep each pixel's min/max within the kept points.
+        x, y = decimate_line(x, y, int(figsize[0] * self.dpi * _DECIMATE_COLUMNS_PER_PIXEL))
+        return ChartSeries(x=x, y=y, **style)
+
+    def _create(self, kind: str, build_spec) -> Optional[str]:
+        if not self._matplotlib_available:
+            logger.error("matplotlib not available")
             return None
 
         try:
-            # Calculate daily returns
-            returns = data['Close'].pct_change().dropna()
-
-            fig, ax = self.plt.subplots(figsize=figsize)
-
-            ax.hist(returns, bins=50, alpha=0.7, color='#2ca02c', edgecolor='black')
-            ax.set_title(title, fontsize=14, fontweight='bold')
-            ax.set_xlabel('Daily Return (%)', fontsize=11)
-            ax.set_ylabel('Frequency', fontsize=11)
-            ax.axvline(returns.mean(), color='red', linestyle='--', linewidth=2, label=f'Mean: {returns.mean():.2%}')
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-
-            self.plt.tight_layout()
-
-            img_data = self._fig_to_base64(fig)
-            self.plt.close(fig)
-
-            return img_data
+            spec = build_spec()
+            if spec is None:
+                return None
+            future, cache_result = self._submit(spec)
+            image, spec, cache_result = self._fit(spec, self.renderer.result(future, spec), cache_result)
+            annotate(bytes=len(image), format=spec.format, dpi=spec.dpi, cache=cache_result)
+            if self.max_bytes:
+                annotate(budget=self.max_bytes, over_budget=len(image) > self.max_bytes)
+            return self.images.reference(image, spec.format)
 
         except Exception as e:
-            logger.error(f"Failed to create returns chart: {e}")
+            logger.error(f"Failed to create {kind} chart: {e}")
             return None
 
-    def _fig_to_base64(self, fig) -> str:
-        """Convert matplotlib figure to base64-encoded PNG."""
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        buf.close()
-        return f"data:image/png;base64,{img_base64}"
+    def _fit(self, spec: ChartSpec, image: bytes, cache_result: str) -> Tuple[bytes, ChartSpec, str]:
+        """
+        Apply the byte budget to a rendered chart.
+
+        Returns the first of ``image`` and its smaller re-renders (see
+        _budget_candidates) within ``max_bytes``, or the smallest of them if
+        none fits, with the spec it was rendered from and its cache outcome.
+        """
+        if not self.max_bytes or len(image) <= self.max_bytes:
+            return image, spec, cache_result
+
+        best = (image, spec, cache_result)
+        for fmt, dpi in _budget_candidates(spec.format, spec.dpi):
+            candidate = replace(spec, format=fmt, dpi=dpi)
+            future, result = self._submit(candidate)
+            smaller = self.renderer.result(future, candidate)
+            if len(smaller) < len(best[0]):
+                best = (smaller, candidate, result)
+            if len(smaller) <= self.max_bytes:
+                break
+        else:
+            logger.warning(
+                f"Chart '{spec.title}' is {len(best[0])} bytes ({best[1].format}, {best[1].dpi} dpi), "
+                f"over the {self.max_bytes} byte budget"
+            )
+        return best
+
+    def _submit(self, spec: ChartSpec) -> Tuple["Future[bytes]", str]:
+        """Start rendering ``spec`` unless the cache has it; returns the future and "hit"/"miss"/"off"."""
+        if self.cache is None:
+            return self.renderer.submit(spec), "off"
+
+        key = chart_key(spec)
+        cached = self.cache.get(key)
+        if cached is not None:
+            future: "Future[bytes]" = Future()
+            future.set_result(cached)
+            return future, "hit"
+
+        future = self.renderer.submit(spec)
+
+        def _store(done: "Future[bytes]") -> None:
+            if done.exception() is None:
+                self.cache.set(key, done.result())
+
+        future.add_done_callback(_store)
+        return future, "miss"
 
 
 def embed_chart_in_html(img_data: str, alt_text: str = "Chart") -> str:
@@ -192,7 +895,7 @@ def embed_chart_in_html(img_data: str, alt_text: str = "Chart") -> str:
     Create HTML img tag for embedded chart.
 
     Args:
-        img_data: Base64-encoded image data URI
+        img_data: Image URL: base64 data URI, file URL or ``cid:`` reference
         alt_text: Alt text for the image
 
     Returns:
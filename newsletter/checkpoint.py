@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from .models import FormInput, SectionDraft, SectionPlan
+
+
+logger = logging.getLogger(__name__)
+
+
+class RunCheckpoint:
+    """
+    Per-run directory of stage checkpoints so a failed run can be resumed.
+
+    Layout under ``<root>/<run_id>/``::
+
+        form.json            the FormInput the run was started with
+        plan.json            planned sections
+        sections/<n>.json    each drafted SectionDraft, by plan position
+        market.json          the market data SectionDraft
+        subject.txt          the composed subject
+
+    A stage whose file exists is treated as complete and skipped on resume.
+    The directory is removed after a successful run (see discard).
+    """
+
+    def __init__(self, root: str, run_id: str):
+        self.run_id = run_id
+        self.path = Path(root) / run_id
+
+    @classmethod
+    def create(cls, root: str, form: FormInput) -> "RunCheckpoint":
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        checkpoint = cls(root, run_id)
+        (checkpoint.path / "sections").mkdir(parents=True, exist_ok=True)
+        checkpoint._write("form.json", form.model_dump_json(indent=2))
+        logger.info(f"Checkpointing run {run_id} to {checkpoint.path}")
+        return checkpoint
+
+    @classmethod
+    def resume(cls, root: str, run_id: str) -> "RunCheckpoint":
+        checkpoint = cls(root, run_id)
+        if not (checkpoint.path / "form.json").exists():
+            raise ValueError(f"No run '{run_id}' found in {root}")
+        logger.info(f"Resuming run {run_id} from {checkpoint.path}")
+        return checkpoint
+
+    def discard(self) -> None:
+        """Delete the run directory once the run has succeeded; only failed runs are kept for --resume."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        logger.info(f"Removed checkpoints of run {self.run_id}")
+
+    def _write(self, name: str, text: str) -> None:
+        # Write-then-rename so an interrupted write never leaves a partial checkpoint
+        target = self.path / name
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, target)
+
+    def _read(self, name: str) -> Optional[str]:
+        target = self.path / name
+        if not target.exists():
+            return None
+        return target.read_text(encoding="utf-8")
+
+    def load_form(self) -> FormInput:
+        return FormInput.model_validate_json(self._read("form.json"))
+
+    def save_plan(self, sections: List[SectionPlan]) -> None:
+        self._write("plan.json", json.dumps([s.model_dump() for s in sections], indent=2))
+
+    def load_plan(self) -> Optional[List[SectionPlan]]:
+        text = self._read("plan.json")
+        if text is None:
+            return None
+        return [SectionPlan(**s) for s in json.loads(text)]
+
+    def save_section(self, index: int, draft: SectionDraft) -> None:
+        self._write(f"sections/{index}.json", draft.model_dump_json(indent=2))
+
+    def load_section(self, index: int) -> Optional[SectionDraft]:
+        text = self._read(f"sections/{index}.json")
+        return SectionDraft.model_validate_json(text) if text is not None else None
+
+    def save_market(self, draft: SectionDraft) -> None:
+        self._write("market.json", draft.model_dump_json(indent=2))
+
+    def load_market(self) -> Optional[SectionDraft]:
+        text = self._read("market.json")
+        return SectionDraft.model_validate_json(text) if text is not None else None
+
+    def save_subject(self, subject: str) -> None:
+        self._write("subject.txt", subject)
+
+    def load_subject(self) -> Optional[str]:
+        return self._read("subject.txt")
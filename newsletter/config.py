@@ -12,19 +12,57 @@ class Settings(BaseSettings):
     llm_temperature: float = Field(0.7, description="Temperature for LLM generation (0.0-1.0)")
     openai_api_key: str | None = Field(default=None)
     anthropic_api_key: str | None = Field(default=None)
+    llm_cache_mode: str = Field("off", description="off, deterministic (temperature 0 only), on, or replay")
+    llm_cache_path: str = Field("~/.cache/newsletter/llm.sqlite3", description="SQLite LLM response cache file")
+    llm_cache_ttl: int = Field(604800, description="Seconds before cached LLM responses expire")
+    llm_cache_max_entries: int = Field(2000, description="Cached LLM responses kept before LRU eviction")
 
     # Tavily
     tavily_api_key: str | None = Field(default=None)
     tavily_endpoint: str = Field("https://api.tavily.com/search")
     tavily_max_results: int = 3
+    http_pool_size: int = Field(16, description="Max pooled keep-alive connections per host")
+    search_cache_path: str | None = Field("~/.cache/newsletter/search.sqlite3", description="SQLite search cache file (empty disables)")
+    search_cache_ttl: int = Field(86400, description="Seconds before cached search results expire")
+    search_cache_max_entries: int = Field(5000, description="Cached searches kept before LRU eviction")
 
     # Output & limits
     max_words: int = 1000
     per_section_word_target: int = 180
+    speculative_planning: bool = Field(False, description="Stream the plan and start section searches as sections appear")
+    shared_research: bool = Field(False, description="Search all sections up front and share deduplicated sources")
+    research_token_budget: int = Field(0, description="Max estimated tokens of research per section prompt (0=unlimited)")
 
     # Market data integration
     enable_market_data: bool = Field(True, description="Auto-generate market data section with charts")
     market_data_position: int = Field(0, description="Position of market section (0=first, -1=last)")
+    market_cache_dir: str | None = Field("~/.cache/newsletter/market", description="On-disk Yahoo/FRED cache (empty disables)")
+    market_cache_ttl: int = Field(900, description="Seconds before cached Yahoo data is refreshed while markets are open")
+    fred_cache_ttl: int = Field(43200, description="Seconds before cached FRED series are refreshed")
+    chart_cache_entries: int = Field(128, description="Rendered charts kept in memory, by content hash (0 disables)")
+    chart_cache_path: str | None = Field("~/.cache/newsletter/charts.sqlite3", description="SQLite chart image cache file (empty disables)")
+    chart_cache_ttl: int = Field(86400, description="Seconds before cached chart images expire on disk")
+    chart_cache_max_entries: int = Field(500, description="Cached chart images kept on disk before LRU eviction")
+    chart_format: str = Field("png", description="png, png8 (palette-quantized, optimized PNG), webp, or svg")
+    chart_dpi: int = Field(100, description="Chart resolution for raster formats")
+    chart_max_bytes: int = Field(0, description="Per-chart size budget; larger charts fall back to png8 and lower dpi (0=unlimited)")
+    chart_image_mode: str = Field("inline", description="inline (base64 data URI), file (written to CHART_IMAGE_DIR), or cid (email attachments)")
+    chart_image_dir: str | None = Field(default=None, description="Where file/cid chart images are written (default <output_dir>/charts)")
+    chart_image_url_prefix: str | None = Field(default=None, description="URL chart files are served from in file mode (default file:// URL of the directory)")
+
+    # Concurrency
+    max_concurrency: int = Field(4, description="Max sections drafted in parallel (1=serial)")
+    batch_concurrency: int = Field(4, description="Max newsletters generated in parallel in --batch mode")
+    chart_workers: int = Field(0, description="Processes rendering charts in parallel (0=render in the calling thread)")
+
+    # Profiling
+    profile_run: bool = Field(False, description="Write a per-stage timing profile (profile.json) next to newsletter.html")
+    profile_chrome_trace: bool = Field(False, description="Also write the profile as profile.trace.json in Chrome trace format")
+
+    # Metrics (requires prometheus-client)
+    metrics_port: int | None = Field(default=None, description="Serve Prometheus metrics on this port")
+    metrics_addr: str = Field("127.0.0.1", description="Address the metrics endpoint binds to")
+    metrics_textfile: str | None = Field(default=None, description="Write metrics here after each run (textfile collector)")
 
     # Email (SMTP)
     smtp_host: str | None = None
@@ -33,6 +71,10 @@ class Settings(BaseSettings):
     smtp_password: str | None = None
     smtp_from: str | None = None
 
+    # Templates
+    template_dir: str | None = Field(default=None, description="Load templates from this directory instead of the package")
+    template_cache_dir: str | None = Field("~/.cache/newsletter/jinja", description="Jinja2 bytecode cache directory (empty disables)")
+
     # Misc
     log_level: str = Field("INFO")
     output_dir: str = Field("output")
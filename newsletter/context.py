@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import logging
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .config import Settings
+from .models import SearchResult, SectionPlan
+
+
+logger = logging.getLogger(__name__)
+
+# Passages are groups of whole sentences up to roughly this many words
+PASSAGE_WORDS = 60
+
+# Passages sharing at least this fraction of word 5-grams are treated as duplicates
+DUPLICATE_OVERLAP = 0.6
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in into is it its of on or that the their this "
+    "to was were what when which who why will with your you our we about over under vs".split()
+)
+
+
+@lru_cache(maxsize=8)
+def _tiktoken_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(settings: Settings, text: str) -> int:
+    """
+    Estimate prompt tokens for the configured provider/model.
+
+    Uses tiktoken for OpenAI models when it is installed; otherwise a
+    characters-per-token heuristic (about 4 for OpenAI, 3.5 for Anthropic).
+    """
+    provider = settings.llm_provider.lower()
+    if provider == "openai":
+        encoding = _tiktoken_encoding(settings.llm_model)
+        if encoding is not None:
+            return len(encoding.encode(text))
+        return math.ceil(len(text) / 4)
+    return math.ceil(len(text) / 3.5)
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def _split_passages(text: str) -> List[str]:
+    sentences = re.split(r"(?<=[.!?])\s+|\n{2,}", text.strip())
+    passages: List[str] = []
+    current: List[str] = []
+    count = 0
+    for sentence in (s.strip() for s in sentences):
+        if not sentence:
+            continue
+        n = len(sentence.split())
+        if current and count + n > PASSAGE_WORDS:
+            passages.append(" ".join(current))
+            current, count = [], 0
+        current.append(sentence)
+        count += n
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+def _shingles(text: str) -> set:
+    words = _words(text)
+    if len(words) < 5:
+        return {tuple(words)}
+    return {tuple(words[i:i + 5]) for i in range(len(words) - 4)}
+
+
+def _is_duplicate(shingles: set, kept: List[set]) -> bool:
+    for other in kept:
+        smaller = min(len(shingles), len(other)) or 1
+        if len(shingles & other) / smaller >= DUPLICATE_OVERLAP:
+            return True
+    return False
+
+
+def section_terms(section: SectionPlan) -> List[str]:
+    """Content words of a section's title and description, used as a relevance query."""
+    return [w for w in _words(f"{section.title} {section.description or ''}") if w not in _STOPWORDS]
+
+
+def relevance_scores(query_terms: List[str], passages: List[str]) -> List[float]:
+    """BM25-style relevance of each passage (or document) to the query terms."""
+    docs = [Counter(_words(p)) for p in passages]
+    n = len(docs)
+    avg_len = sum(sum(d.values()) for d in docs) / n if n else 0.0
+    idf: Dict[str, float] = {}
+    for term in set(query_terms):
+        df = sum(1 for d in docs if term in d)
+        idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    scores = []
+    for doc in docs:
+        length = sum(doc.values()) or 1
+        score = 0.0
+        for term in query_terms:
+            tf = doc.get(term, 0)
+            if not tf:
+                continue
+            score += idf[term] * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / (avg_len or 1)))
+        scores.append(score)
+    return scores
+
+
+def build_research_context(
+    settings: Settings,
+    section: SectionPlan,
+    results: List[SearchResult],
+    budget: Optional[int] = None,
+) -> Tuple[str, List[SearchResult]]:
+    """
+    Pack the most relevant, non-duplicate passages of ``results`` into a token budget.
+
+    Source contents are split into passages, near-duplicates across sources
+    are dropped, and the rest are ranked against the section title and
+    description and added greedily until ``budget`` (default
+    ``settings.research_token_budget``; 0 disables packing) is reached.
+
+    Returns the research block for the prompt and the sources it cites, in
+    their original order.
+    """
+    budget = settings.research_token_budget if budget is None else budget
+
+    if budget <= 0:
+        lines = [
+            f"[Source {i}] URL: {r.url}\nTitle: {r.title or ''}\nContent: {r.content or ''}"
+            for i, r in enumerate(results, start=1)
+        ]
+        return "\n\n".join(lines), list(results)
+
+    # (source index, position within source, passage)
+    candidates: List[Tuple[int, int, str]] = []
+    kept_shingles: List[set] = []
+    for src, r in enumerate(results):
+        # Title-only results still get a slot so their URL can be cited
+        for pos, passage in enumerate(_split_passages(r.content or r.title or "")):
+            shingles = _shingles(passage)
+            if _is_duplicate(shingles, kept_shingles):
+                continue
+            kept_shingles.append(shingles)
+            candidates.append((src, pos, passage))
+
+    query_terms = section_terms(section)
+    scores = relevance_scores(query_terms, [c[2] for c in candidates])
+    # Highest score first; ties keep source rank and passage order
+    ranked = sorted(range(len(candidates)), key=lambda i: (-scores[i], candidates[i][0], candidates[i][1]))
+
+    selected: dict = {}
+    used = 0
+    for i in ranked:
+        src, pos, passage = candidates[i]
+        cost = estimate_tokens(settings, passage)
+        if src not in selected:
+            r = results[src]
+            cost += estimate_tokens(settings, f"[Source 0] URL: {r.url}\nTitle: {r.title or ''}\nContent: ")
+        if used + cost > budget:
+            continue
+        selected.setdefault(src, []).append((pos, passage))
+        used += cost
+
+    lines = []
+    sources = []
+    for src in sorted(selected):
+        r = results[src]
+        content = " … ".join(p for _, p in sorted(selected[src]))
+        sources.append(r)
+        lines.append(f"[Source {len(sources)}] URL: {r.url}\nTitle: {r.title or ''}\nContent: {content}")
+
+    logger.debug(
+        "Research context for '%s': %d/%d passages, ~%d tokens",
+        section.title, sum(len(v) for v in selected.values()), len(candidates), used,
+    )
+    return "\n\n".join(lines), sources
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import pandas as pd
 
+from .market_cache import TimeSeriesCache, exchange_time, merge_history
+from .profiling import annotate, profiled, span, submit
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SUMMARY_TICKERS = ["^GSPC", "^DJI", "^IXIC", "^VIX"]  # S&P 500, Dow, Nasdaq, VIX
+
+ECONOMIC_INDICATORS = {
+    "DGS10": "10Y Treasury Yield",
+    "DFF": "Fed Funds Rate",
+    "UNRATE": "Unemployment Rate",
+    "CPIAUCSL": "CPI",
+}
+
 
 class FinancialDataFetcher:
     """Fetches real financial data from yfinance, FRED, and other sources."""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[TimeSeriesCache] = None):
         self._yfinance_available = False
         self._fred_available = False
+        self.cache = cache
 
         try:
             import yfinance as yf
@@ -29,6 +45,7 @@ class FinancialDataFetcher:
         except ImportError:
             logger.warning("pandas-datareader not installed - FRED data will be unavailable")
 
+    @profiled("market.stock_data")
     def get_stock_data(
         self,
         ticker: str,
@@ -50,15 +67,173 @@ class FinancialDataFetcher:
             logger.error("yfinance not available")
             return None
 
-        try:
-            ticker_obj = self.yf.Ticker(ticker)
-            data = ticker_obj.history(period=period, interval=interval)
-            logger.info(f"Fetched {len(data)} rows for {ticker}")
-            return data
-        except Exception as e:
-            logger.error(f"Failed to fetch stock data for {ticker}: {e}")
-            return None
+        cached = None
+        if self._cacheable(period, interval):
+            key = f"{ticker}@{interval}"
+            cached = self.cache.read("yahoo", key)
+            if _covers(cached, period):
+                if self.cache.is_fresh("yahoo", key):
+                    annotate(ticker=ticker, cache="hit")
+                    return _slice_period(cached, period)
+                annotate(ticker=ticker, cache="stale")
+                # Only the bars since the last cached one can have changed
+                tail = self._fetch_history(ticker, interval=interval, start=cached.index[-1].date())
+                if tail is None:
+                    logger.warning(f"Serving stale cached data for {ticker}")
+                    return _slice_period(cached, period)
+                try:
+                    merged = merge_history(cached, tail)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Cached history for {ticker} does not merge with new bars, refetching: {e}")
+                    cached = None
+                else:
+                    self.cache.write("yahoo", key, merged)
+                    return _slice_period(merged, period)
+            else:
+                annotate(ticker=ticker, cache="miss")
+        else:
+            annotate(ticker=ticker, cache="off")
+
+        return self._fetch_and_cache(ticker, period, interval, cached)
+
+    def _cacheable(self, period: str, interval: str) -> bool:
+        return self.cache is not None and interval in _CACHEABLE_INTERVALS and period in _PERIOD_DAYS
+
+    def _fetch_and_cache(
+        self, ticker: str, period: str, interval: str, cached: Optional[pd.DataFrame]
+    ) -> Optional[pd.DataFrame]:
+        """Download ``period`` of history for a cache miss and merge it into the cached series."""
+        data = self._fetch_history(ticker, period=period, interval=interval)
+        if self._cacheable(period, interval) and data is not None and not data.empty:
+            self.cache.write("yahoo", f"{ticker}@{interval}", _merge_or_replace(cached, data, ticker))
+        return data
+
+    def _fetch_history(self, ticker: str, **kwargs) -> Optional[pd.DataFrame]:
+        with span("yahoo.history", ticker=ticker) as attrs:
+            try:
+                ticker_obj = self.yf.Ticker(ticker)
+                data = exchange_time(ticker_obj.history(**kwargs))
+                logger.info(f"Fetched {len(data)} rows for {ticker}")
+                attrs.update(rows=len(data), bytes=int(data.memory_usage(deep=True).sum()))
+                return data
+            except Exception as e:
+                logger.error(f"Failed to fetch stock data for {ticker}: {e}")
+                attrs["error"] = type(e).__name__
+                return None
+
+    def _download(self, tickers: List[str], **kwargs) -> Dict[str, pd.DataFrame]:
+        """One batched yf.download call, split into a frame per returned ticker."""
+        with span("yahoo.download", tickers=len(tickers)) as attrs:
+            data = self.yf.download(tickers, group_by="ticker", threads=True, progress=False, **kwargs)
+            attrs.update(rows=len(data), bytes=int(data.memory_usage(deep=True).sum()))
+        frames: Dict[str, pd.DataFrame] = {}
+        if isinstance(data.columns, pd.MultiIndex):
+            for ticker in tickers:
+                if ticker in data.columns.get_level_values(0):
+                    frame = data[ticker].dropna(how="all")
+                    if not frame.empty:
+                        frames[ticker] = exchange_time(frame)
+        elif len(tickers) == 1 and not data.empty:
+            frames[tickers[0]] = exchange_time(data)
+        return frames
+
+    @profiled("market.stock_data_bulk")
+    def get_stock_data_bulk(
+        self,
+        tickers: List[str],
+        period: str = "1mo",
+        interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch price data for several tickers in one batched Yahoo Finance request.
+
+        Tickers missing from the batched response (or all of them, if the batch
+        request fails) are fetched individually on a small thread pool.
+
+        Args:
+            tickers: Stock ticker symbols
+            period: Time period (see get_stock_data)
+            interval: Data interval (see get_stock_data)
 
+        Returns:
+            Dict mapping ticker to its OHLCV DataFrame; failed tickers are omitted
+        """
+        if not self._yfinance_available:
+            logger.error("yfinance not available")
+            return {}
+
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+
+        frames: Dict[str, pd.DataFrame] = {}
+        cached: Dict[str, pd.DataFrame] = {}
+        stale: Dict[str, pd.DataFrame] = {}
+        if self._cacheable(period, interval):
+            for ticker in tickers:
+                key = f"{ticker}@{interval}"
+                data = self.cache.read("yahoo", key)
+                if data is None:
+                    continue
+                if not _covers(data, period):
+                    cached[ticker] = data
+                elif self.cache.is_fresh("yahoo", key):
+                    frames[ticker] = _slice_period(data, period)
+                else:
+                    stale[ticker] = data
+
+        if self._cacheable(period, interval):
+            annotate(cache_hits=len(frames), cache_stale=len(stale), cache_misses=len(tickers) - len(frames) - len(stale))
+        annotate(tickers=len(tickers))
+        if stale:
+            # Refresh stale series with one request for the tail since the oldest last bar
+            start = min(data.index[-1].date() for data in stale.values())
+            try:
+                tails = self._download(list(stale), start=start, interval=interval)
+            except Exception as e:
+                logger.warning(f"Tail refresh failed, serving stale cached data: {e}")
+                tails = None
+            for ticker, data in stale.items():
+                if tails is not None:
+                    try:
+                        data = merge_history(data, tails.get(ticker))
+                    except (TypeError, ValueError) as e:
+                        # Leave it out of frames so it is refetched in full below
+                        logger.warning(f"Cached history for {ticker} does not merge with new bars, refetching: {e}")
+                        continue
+                    self.cache.write("yahoo", f"{ticker}@{interval}", data)
+                frames[ticker] = _slice_period(data, period)
+
+        to_fetch = [t for t in tickers if t not in frames]
+        if to_fetch:
+            try:
+                fetched = self._download(to_fetch, period=period, interval=interval)
+                logger.info(f"Fetched {len(fetched)}/{len(to_fetch)} tickers in one batch ({period}, {interval})")
+                for ticker, data in fetched.items():
+                    if self._cacheable(period, interval):
+                        self.cache.write("yahoo", f"{ticker}@{interval}", _merge_or_replace(cached.get(ticker), data, ticker))
+                    frames[ticker] = data
+            except Exception as e:
+                logger.warning(f"Batched download failed, fetching tickers individually: {e}")
+
+        missing = [t for t in tickers if t not in frames]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as pool:
+                # Straight to the download: these lookups were already counted in
+                # this span's cache_* attributes, and MarketDataStore.get_stock_data
+                # takes the per-ticker locks its bulk caller already holds
+                futures = [
+                    submit(pool, self._fetch_and_cache, t, period, interval, cached.get(t))
+                    for t in missing
+                ]
+                for ticker, future in zip(missing, futures):
+                    frame = future.result()
+                    if frame is not None and not frame.empty:
+                        frames[ticker] = frame
+
+        return frames
+
+    @profiled("yahoo.info")
     def get_stock_info(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
         Get stock metadata and key statistics.
@@ -82,11 +257,13 @@ class FinancialDataFetcher:
             logger.error(f"Failed to fetch stock info for {ticker}: {e}")
             return None
 
+    @profiled("market.fred")
     def get_fred_data(
         self,
         series_id: str,
         start: Optional[datetime] = None,
-        end: Optional[datetime] = None
+        end: Optional[datetime] = None,
+        timeout: float = 30
     ) -> Optional[pd.DataFrame]:
         """
         Fetch economic data from FRED (Federal Reserve Economic Data).
@@ -102,6 +279,7 @@ class FinancialDataFetcher:
             series_id: FRED series identifier
             start: Start date (defaults to 1 year ago)
             end: End date (defaults to today)
+            timeout: HTTP timeout in seconds for the FRED request
 
         Returns:
             DataFrame with time series data or None if fetch fails
@@ -112,16 +290,51 @@ class FinancialDataFetcher:
 
         if start is None:
             start = datetime.now() - timedelta(days=365)
+        # Only open-ended requests (up to today) are served from the cache
+        use_cache = self.cache is not None and end is None
         if end is None:
             end = datetime.now()
 
-        try:
-            data = self.pdr.data.DataReader(series_id, "fred", start, end)
-            logger.info(f"Fetched {len(data)} rows for FRED series {series_id}")
-            return data
-        except Exception as e:
-            logger.error(f"Failed to fetch FRED data for {series_id}: {e}")
-            return None
+        cached = None
+        if use_cache:
+            cached = self.cache.read("fred", series_id)
+            if cached is not None and not cached.empty and cached.index[0] <= start + _FRED_COVER_SLACK:
+                fresh = self.cache.is_fresh("fred", series_id)
+                annotate(series_id=series_id, cache="hit" if fresh else "stale")
+                if fresh:
+                    return cached[cached.index >= pd.Timestamp(start)]
+                tail = self._fetch_fred(series_id, cached.index[-1], end, timeout)
+                if tail is None:
+                    logger.warning(f"Serving stale cached data for FRED series {series_id}")
+                    return cached[cached.index >= pd.Timestamp(start)]
+                try:
+                    merged = merge_history(cached, tail)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Cached FRED series {series_id} does not merge with new rows, refetching: {e}")
+                    cached = None
+                else:
+                    self.cache.write("fred", series_id, merged)
+                    return merged[merged.index >= pd.Timestamp(start)]
+
+        annotate(series_id=series_id, cache="miss" if use_cache else "off")
+        data = self._fetch_fred(series_id, start, end, timeout)
+        if use_cache and data is not None and not data.empty:
+            self.cache.write("fred", series_id, _merge_or_replace(cached, data, series_id))
+        return data
+
+    def _fetch_fred(self, series_id: str, start: datetime, end: datetime, timeout: float) -> Optional[pd.DataFrame]:
+        with span("fred.fetch", series_id=series_id) as attrs:
+            try:
+                # DataReader() has no timeout argument; the reader applies it to each request
+                reader = self.pdr.fred.FredReader(series_id, start=start, end=end, timeout=timeout)
+                data = reader.read()
+                logger.info(f"Fetched {len(data)} rows for FRED series {series_id}")
+                attrs.update(rows=len(data), bytes=int(data.memory_usage(deep=True).sum()))
+                return data
+            except Exception as e:
+                logger.error(f"Failed to fetch FRED data for {series_id}: {e}")
+                attrs["error"] = type(e).__name__
+                return None
 
     def get_market_summary(self, tickers: List[str] = None) -> Dict[str, Any]:
         """
@@ -134,11 +347,12 @@ class FinancialDataFetcher:
             Dict with market summary data
         """
         if tickers is None:
-            tickers = ["^GSPC", "^DJI", "^IXIC", "^VIX"]  # S&P 500, Dow, Nasdaq, VIX
+            tickers = DEFAULT_SUMMARY_TICKERS
 
         summary = {}
+        frames = self.get_stock_data_bulk(tickers, period="5d", interval="1d")
         for ticker in tickers:
-            data = self.get_stock_data(ticker, period="5d", interval="1d")
+            data = frames.get(ticker)
             if data is not None and not data.empty:
                 latest = data.iloc[-1]
                 prev = data.iloc[-2] if len(data) > 1 else latest
@@ -152,23 +366,40 @@ class FinancialDataFetcher:
 
         return summary
 
-    def get_economic_indicators(self) -> Dict[str, Any]:
+    @profiled("market.indicators")
+    def get_economic_indicators(self, timeout: float = 10, max_workers: int = 4) -> Dict[str, Any]:
         """
         Fetch key economic indicators from FRED.
 
+        Series are fetched concurrently; any series not back within ``timeout``
+        seconds is skipped so one slow series does not stall the rest.
+
+        Args:
+            timeout: Seconds to wait for each series
+            max_workers: Max concurrent FRED requests
+
         Returns:
             Dict with latest values of key economic metrics
         """
-        indicators = {
-            "DGS10": "10Y Treasury Yield",
-            "DFF": "Fed Funds Rate",
-            "UNRATE": "Unemployment Rate",
-            "CPIAUCSL": "CPI",
+        indicators = ECONOMIC_INDICATORS
+        start = datetime.now() - timedelta(days=90)
+        pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(indicators))))
+        futures = {
+            series_id: submit(pool, self.get_fred_data, series_id, start=start, timeout=timeout)
+            for series_id in indicators
         }
+        done, _ = wait(futures.values(), timeout=timeout)
+        # Don't block on stragglers; they finish in the background once their
+        # request timeout (per attempt, FredReader retries) runs out
+        pool.shutdown(wait=False, cancel_futures=True)
 
         results = {}
         for series_id, name in indicators.items():
-            data = self.get_fred_data(series_id, start=datetime.now() - timedelta(days=90))
+            future = futures[series_id]
+            if future not in done:
+                logger.warning(f"Timed out after {timeout}s fetching FRED series {series_id}")
+                continue
+            data = future.result()
             if data is not None and not data.empty:
                 latest = data.iloc[-1].values[0]
                 results[name] = {
@@ -180,6 +411,189 @@ class FinancialDataFetcher:
         return results
 
 
+# Approximate span of each Yahoo period string, used to decide whether a cached
+# history covers a requested window. "ytd" is the upper bound; _period_days
+# gives its actual length.
+_PERIOD_DAYS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 31,
+    "3mo": 92,
+    "6mo": 183,
+    "ytd": 366,
+    "1y": 366,
+    "2y": 731,
+    "5y": 1827,
+    "10y": 3653,
+    "max": 10**6,
+}
+
+
+# Intervals worth caching on disk; intraday bars are too short-lived.
+_CACHEABLE_INTERVALS = {"1d", "5d", "1wk", "1mo", "3mo"}
+
+# A cached history "covers" a window if it starts within this slack of the
+# window start (weekends/holidays for daily data, release lag for FRED).
+_YAHOO_COVER_SLACK = timedelta(days=4)
+_FRED_COVER_SLACK = timedelta(days=35)
+
+
+def _merge_or_replace(cached: Optional[pd.DataFrame], fresh: pd.DataFrame, name: str) -> pd.DataFrame:
+    """merge_history, or just ``fresh`` if the cached rows cannot be merged with it."""
+    try:
+        return merge_history(cached, fresh)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Replacing cached history for {name} that does not merge with new rows: {e}")
+        return fresh
+
+
+def _period_days(period: str) -> Optional[int]:
+    """Calendar days spanned by a Yahoo period string, with "ytd" counted up to today."""
+    if period == "ytd":
+        return datetime.now().timetuple().tm_yday
+    return _PERIOD_DAYS.get(period)
+
+
+def _covers(data: Optional[pd.DataFrame], period: str) -> bool:
+    """Whether a cached history reaches back far enough to serve ``period``."""
+    if data is None or data.empty or period not in _PERIOD_DAYS or period == "max":
+        return False
+    days = _period_days(period)
+    if period.endswith("d") and period != "ytd":
+        # Trading sessions -> calendar days, allowing for weekends
+        days = days * 7 // 5 + 1
+    now = pd.Timestamp.now(tz=data.index.tz)
+    return data.index[0] <= now - timedelta(days=days) + _YAHOO_COVER_SLACK
+
+
+def _slice_period(data: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Derive a shorter Yahoo period window from a longer history."""
+    if data.empty or period == "max":
+        return data
+    if period.endswith("d") and period != "ytd":
+        # Day periods count trading sessions, as Yahoo does
+        sessions = pd.Index(data.index.normalize()).unique()[-int(period[:-1]):]
+        return data[data.index.normalize().isin(sessions)]
+    last = data.index[-1]
+    if period == "ytd":
+        return data[data.index >= last.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)]
+    if period.endswith("mo"):
+        start = last - pd.DateOffset(months=int(period[:-2]))
+    else:
+        start = last - pd.DateOffset(years=int(period[:-1]))
+    return data[data.index > start]
+
+
+class MarketDataStore(FinancialDataFetcher):
+    """
+    Per-run market data cache.
+
+    Each (ticker, interval) is downloaded once at the longest window requested
+    so far; shorter windows are sliced from it, so a run touches Yahoo at most
+    once per ticker when the longest window is prefetched. Economic indicators
+    are kept for the life of the store once every series has come back; a
+    partial result is retried on the next call. Safe to share across threads
+    and batch jobs.
+    """
+
+    def __init__(self, cache: Optional[TimeSeriesCache] = None):
+        super().__init__(cache)
+        self._history: Dict[tuple, tuple] = {}
+        self._indicators: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _cached(self, ticker: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        cached = self._history.get((ticker, interval))
+        if cached is not None:
+            cached_period, data = cached
+            if (_period_days(cached_period) or 0) >= (_period_days(period) or 10**6):
+                return _slice_period(data, period)
+        return None
+
+    def prefetch(self, windows: Dict[str, str], interval: str = "1d") -> None:
+        """Download each ticker's window up front, e.g. ``{"^VIX": "3mo", "SPY": "5d"}``.
+
+        Tickers sharing a window are downloaded in one batched request.
+        """
+        by_period: Dict[str, List[str]] = {}
+        for ticker, period in windows.items():
+            by_period.setdefault(period, []).append(ticker)
+        for period, tickers in by_period.items():
+            self.get_stock_data_bulk(tickers, period=period, interval=interval)
+
+    def get_stock_data_bulk(
+        self,
+        tickers: List[str],
+        period: str = "1mo",
+        interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        frames: Dict[str, pd.DataFrame] = {}
+        missing: List[str] = []
+        for ticker in dict.fromkeys(tickers):
+            data = self._cached(ticker, period, interval)
+            if data is not None:
+                frames[ticker] = data
+            else:
+                missing.append(ticker)
+        if not missing:
+            return frames
+
+        # Hold every missing ticker's lock (in sorted order, so concurrent bulk
+        # calls can't deadlock) while downloading, so overlapping requests from
+        # other jobs wait for this download instead of repeating it
+        with ExitStack() as stack:
+            for ticker in sorted(missing):
+                stack.enter_context(self._key_lock((ticker, interval)))
+            to_fetch = []
+            for ticker in missing:
+                data = self._cached(ticker, period, interval)
+                if data is not None:
+                    frames[ticker] = data
+                else:
+                    to_fetch.append(ticker)
+
+            if to_fetch:
+                fetched = super().get_stock_data_bulk(to_fetch, period=period, interval=interval)
+                with self._lock:
+                    for ticker, data in fetched.items():
+                        self._history[(ticker, interval)] = (period, data)
+                frames.update(fetched)
+        return frames
+
+    def get_stock_data(
+        self,
+        ticker: str,
+        period: str = "1mo",
+        interval: str = "1d"
+    ) -> Optional[pd.DataFrame]:
+        key = (ticker, interval)
+        with self._key_lock(key):
+            data = self._cached(ticker, period, interval)
+            if data is not None:
+                return data
+
+            data = super().get_stock_data(ticker, period=period, interval=interval)
+            if data is not None and not data.empty:
+                self._history[key] = (period, data)
+            return data
+
+    def get_economic_indicators(self, timeout: float = 10, max_workers: int = 4) -> Dict[str, Any]:
+        with self._key_lock(("__fred__",)):
+            if self._indicators is not None:
+                return self._indicators
+            indicators = super().get_economic_indicators(timeout=timeout, max_workers=max_workers)
+            # Keep partial results (timeouts, failed series) for this call only,
+            # so the next job in a batch retries FRED instead of inheriting the gap
+            if len(indicators) == len(ECONOMIC_INDICATORS):
+                self._indicators = indicators
+            return indicators
+
+
 def format_market_summary(summary: Dict[str, Any]) -> str:
     """Format market summary data for inclusion in newsletter."""
     lines = ["## Market Snapshot", ""]
@@ -189,6 +603,14 @@ def format_market_summary(summary: Dict[str, Any]) -> str:
         "^DJI": "Dow Jones",
         "^IXIC": "Nasdaq",
         "^VIX": "VIX",
+        "SPY": "SPY (S&P 500 ETF)",
+        "QQQ": "QQQ (Nasdaq 100 ETF)",
+        "TLT": "TLT (20Y+ Treasuries)",
+        "IEF": "IEF (7-10Y Treasuries)",
+        "XLE": "XLE (Energy Sector)",
+        "USO": "USO (Crude Oil)",
+        "BTC-USD": "Bitcoin",
+        "ETH-USD": "Ethereum",
     }
 
     for ticker, data in summary.items():
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
 import logging
+import mimetypes
+import re
 import smtplib
 from email.message import EmailMessage
+from pathlib import Path
 from typing import Iterable
 
+from .charts import CID_DOMAIN, chart_image_dir
 from .config import Settings
 
 
 logger = logging.getLogger(__name__)
 
+# <img src="cid:<file name>@newsletter"> references written by ChartImageStore in cid mode
+_CID_SRC = re.compile(r'src="cid:([\w.-]+)@' + re.escape(CID_DOMAIN) + '"')
+
+
+def _attach_images(part: EmailMessage, html: str, image_dir: Path) -> None:
+    """Attach each chart the HTML references by cid: as a related part of ``part``."""
+    for name in dict.fromkeys(_CID_SRC.findall(html)):
+        path = image_dir / name
+        try:
+            data = path.read_bytes()
+        except OSError as e:
+            logger.warning("Chart image %s not attached: %s", path, e)
+            continue
+        maintype, subtype = (mimetypes.guess_type(name)[0] or "application/octet-stream").split("/", 1)
+        part.add_related(
+            data,
+            maintype=maintype,
+            subtype=subtype,
+            cid=f"<{name}@{CID_DOMAIN}>",
+            disposition="inline",
+            filename=name,
+        )
+
 
 def send_email(settings: Settings, subject: str, html: str, to_addrs: Iterable[str]) -> None:
     if not (settings.smtp_host and settings.smtp_username and settings.smtp_password and settings.smtp_from):
@@ -21,10 +48,17 @@ def send_email(settings: Settings, subject: str, html: str, to_addrs: Iterable[s
     msg["Subject"] = subject
     msg.set_content("This is an HTML newsletter. Please use an HTML-enabled client.")
     msg.add_alternative(html, subtype="html")
+    mode = settings.chart_image_mode.lower()
+    if mode == "cid":
+        _attach_images(msg.get_payload()[-1], html, Path(chart_image_dir(settings)).expanduser())
+    elif mode == "file" and not settings.chart_image_url_prefix:
+        logger.warning(
+            "CHART_IMAGE_MODE=file without CHART_IMAGE_URL_PREFIX: charts link to local file:// "
+            "paths that recipients cannot load; set the prefix or use CHART_IMAGE_MODE=cid"
+        )
 
     logger.info("Sending email to %s via %s", to_addrs, settings.smtp_host)
     with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as smtp:
         smtp.starttls()
         smtp.login(settings.smtp_username, settings.smtp_password)
         smtp.send_message(msg)
-
@@ -1,22 +1,216 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from .cache import SQLiteCache, open_cache
 from .config import Settings
+from .profiling import annotate, detached_span, span, span_scope
 
 
 logger = logging.getLogger(__name__)
 
+_ANTHROPIC_MAX_TOKENS = 2048
+
+# Part of every response cache key; bump to invalidate cached responses.
+_CACHE_VERSION = "v1"
+
+# SDK clients keep an HTTP connection pool, so they are created once per
+# (provider, api_key) and reused for the life of the process.
+_clients: Dict[tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+# Async SDK clients are bound to the event loop they were created on, so they
+# are shared per loop rather than per process.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def chat_completion(settings: Settings, system: str, user: str) -> str:
-    provider = settings.llm_provider.lower()
-    if provider == "openai":
-        return _openai_chat(settings, system, user)
-    elif provider == "anthropic":
-        return _anthropic_chat(settings, system, user)
-    else:
-        raise ValueError(f"Unsupported llm_provider: {settings.llm_provider}")
+    with span("llm.chat", provider=settings.llm_provider.lower(), model=settings.llm_model) as attrs:
+        cache, key = _response_cache(settings, system, user)
+        if cache is not None:
+            cached = _cache_get(cache, key)
+            if cached is not None:
+                attrs.update(cache="hit", bytes=len(cached.encode("utf-8")))
+                return cached
+            attrs["cache"] = "miss"
+            _check_replay(settings)
+
+        provider = settings.llm_provider.lower()
+        if provider == "openai":
+            text = _openai_chat(settings, system, user)
+        elif provider == "anthropic":
+            text = _anthropic_chat(settings, system, user)
+        else:
+            raise ValueError(f"Unsupported llm_provider: {settings.llm_provider}")
+
+        attrs["bytes"] = len(text.encode("utf-8"))
+        if cache is not None:
+            _cache_set(cache, key, text)
+        return text
+
+
+async def achat_completion(settings: Settings, system: str, user: str) -> str:
+    """Async counterpart of chat_completion using the providers' async SDK clients."""
+    with span("llm.chat", provider=settings.llm_provider.lower(), model=settings.llm_model) as attrs:
+        # SQLite cache I/O runs in a thread so it doesn't block other coroutines
+        cache, key = await asyncio.to_thread(_response_cache, settings, system, user)
+        if cache is not None:
+            cached = await asyncio.to_thread(_cache_get, cache, key)
+            if cached is not None:
+                attrs.update(cache="hit", bytes=len(cached.encode("utf-8")))
+                return cached
+            attrs["cache"] = "miss"
+            _check_replay(settings)
+
+        provider = settings.llm_provider.lower()
+        if provider == "openai":
+            text = await _aopenai_chat(settings, system, user)
+        elif provider == "anthropic":
+            text = await _aanthropic_chat(settings, system, user)
+        else:
+            raise ValueError(f"Unsupported llm_provider: {settings.llm_provider}")
+
+        attrs["bytes"] = len(text.encode("utf-8"))
+        if cache is not None:
+            await asyncio.to_thread(_cache_set, cache, key, text)
+        return text
+
+
+def stream_chat_completion(settings: Settings, system: str, user: str) -> Iterator[str]:
+    """Like chat_completion, but yields text chunks as the provider generates them.
+
+    Cached responses (see LLM_CACHE_MODE) are yielded as a single chunk; a
+    fully streamed response is stored in the cache once it completes.
+    """
+    started = time.perf_counter()
+    # The caller runs between chunks, so this span is only current (for
+    # annotate) while the stream itself is being read
+    with detached_span("llm.stream", provider=settings.llm_provider.lower(), model=settings.llm_model) as attrs:
+        with span_scope(attrs):
+            cache, key = _response_cache(settings, system, user)
+            cached = _cache_get(cache, key) if cache is not None else None
+        if cache is not None:
+            if cached is not None:
+                attrs.update(cache="hit", bytes=len(cached.encode("utf-8")))
+                yield cached
+                return
+            attrs["cache"] = "miss"
+            _check_replay(settings)
+
+        provider = settings.llm_provider.lower()
+        if provider == "openai":
+            chunks = _openai_stream(settings, system, user)
+        elif provider == "anthropic":
+            chunks = _anthropic_stream(settings, system, user)
+        else:
+            raise ValueError(f"Unsupported llm_provider: {settings.llm_provider}")
+
+        parts: List[str] = []
+        while True:
+            with span_scope(attrs):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            if not parts:
+                attrs["first_chunk_seconds"] = round(time.perf_counter() - started, 6)
+            parts.append(chunk)
+            yield chunk
+
+        text = "".join(parts)
+        attrs["bytes"] = len(text.encode("utf-8"))
+        if cache is not None:
+            with span_scope(attrs):
+                _cache_set(cache, key, text)
+
+
+def _response_cache(settings: Settings, system: str, user: str) -> Tuple[Optional[SQLiteCache], str]:
+    """Return the response cache and key for this call, or (None, "") when not caching.
+
+    Modes (LLM_CACHE_MODE): "off"; "deterministic" caches only temperature-0
+    calls; "on" caches every call; "replay" serves only from the cache and
+    fails on a miss, for tests and offline re-renders. A cache that cannot be
+    opened is logged and skipped, except in replay mode.
+    """
+    mode = settings.llm_cache_mode.lower()
+    if mode == "off" or (mode == "deterministic" and settings.llm_temperature != 0):
+        return None, ""
+    if mode not in ("deterministic", "on", "replay"):
+        raise ValueError(f"Unsupported llm_cache_mode: {settings.llm_cache_mode}")
+
+    request = {
+        "provider": settings.llm_provider.lower(),
+        "model": settings.llm_model,
+        "temperature": settings.llm_temperature,
+        "max_tokens": _ANTHROPIC_MAX_TOKENS if settings.llm_provider.lower() == "anthropic" else None,
+        "system": system,
+        "user": user,
+    }
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    key = f"llm:{_CACHE_VERSION}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+    try:
+        cache = open_cache(settings.llm_cache_path, ttl=settings.llm_cache_ttl, max_entries=settings.llm_cache_max_entries)
+    except Exception as e:
+        if mode == "replay":
+            raise RuntimeError(f"LLM replay mode: response cache unavailable: {e}") from e
+        logger.warning(f"LLM cache unavailable: {e}")
+        return None, ""
+    return cache, key
+
+
+def _cache_get(cache: SQLiteCache, key: str) -> Optional[str]:
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"LLM cache read failed: {e}")
+        return None
+
+
+def _cache_set(cache: SQLiteCache, key: str, text: str) -> None:
+    try:
+        cache.set(key, text)
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
+
+
+def _check_replay(settings: Settings) -> None:
+    if settings.llm_cache_mode.lower() == "replay":
+        raise RuntimeError(
+            f"LLM replay mode: no cached response for {settings.llm_provider}/{settings.llm_model}"
+        )
+
+
+def _annotate_usage(usage: Any, input_attr: str, output_attr: str) -> None:
+    """Record provider-reported token usage on the current profiling span."""
+    if usage is not None:
+        annotate(tokens_in=getattr(usage, input_attr, None), tokens_out=getattr(usage, output_attr, None))
+
+
+def _client(provider: str, api_key: str, factory) -> Any:
+    """Return the shared client for (provider, api_key), creating it once."""
+    key = (provider, api_key)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = factory(api_key)
+        return _clients[key]
+
+
+def _async_client(provider: str, api_key: str, factory) -> Any:
+    """Return the async client for (provider, api_key) on the running loop, creating it once."""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    key = (provider, api_key)
+    if key not in clients:
+        clients[key] = factory(api_key)
+    return clients[key]
 
 
 def _openai_chat(settings: Settings, system: str, user: str) -> str:
@@ -28,7 +222,7 @@ def _openai_chat(settings: Settings, system: str, user: str) -> str:
     if not settings.openai_api_key:
         raise RuntimeError("Missing OPENAI_API_KEY for OpenAI provider")
 
-    client = OpenAI(api_key=settings.openai_api_key)
+    client = _client("openai", settings.openai_api_key, lambda key: OpenAI(api_key=key))
     logger.debug("Calling OpenAI model %s", settings.llm_model)
 
     try:
@@ -40,6 +234,7 @@ def _openai_chat(settings: Settings, system: str, user: str) -> str:
             ],
             temperature=settings.llm_temperature,
         )
+        _annotate_usage(resp.usage, "prompt_tokens", "completion_tokens")
         return resp.choices[0].message.content or ""
     except Exception as e:
         logger.error(f"OpenAI API failed: {e}")
@@ -55,17 +250,18 @@ def _anthropic_chat(settings: Settings, system: str, user: str) -> str:
     if not settings.anthropic_api_key:
         raise RuntimeError("Missing ANTHROPIC_API_KEY for Anthropic provider")
 
-    client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    client = _client("anthropic", settings.anthropic_api_key, lambda key: anthropic.Anthropic(api_key=key))
     logger.debug("Calling Anthropic model %s", settings.llm_model)
 
     try:
         msg = client.messages.create(
             model=settings.llm_model,
-            max_tokens=2048,
+            max_tokens=_ANTHROPIC_MAX_TOKENS,
             temperature=settings.llm_temperature,
             system=system,
             messages=[{"role": "user", "content": user}],
         )
+        _annotate_usage(msg.usage, "input_tokens", "output_tokens")
         # content is a list of blocks; assemble text
         parts: List[str] = []
         for block in msg.content:
@@ -76,3 +272,125 @@ def _anthropic_chat(settings: Settings, system: str, user: str) -> str:
         logger.error(f"Anthropic API failed: {e}")
         raise ValueError(f"LLM generation failed: {str(e)}") from e
 
+
+def _openai_stream(settings: Settings, system: str, user: str) -> Iterator[str]:
+    try:
+        from openai import OpenAI
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("openai package not installed") from e
+
+    if not settings.openai_api_key:
+        raise RuntimeError("Missing OPENAI_API_KEY for OpenAI provider")
+
+    client = _client("openai", settings.openai_api_key, lambda key: OpenAI(api_key=key))
+    logger.debug("Streaming OpenAI model %s", settings.llm_model)
+
+    try:
+        stream = client.chat.completions.create(
+            model=settings.llm_model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=settings.llm_temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if getattr(chunk, "usage", None):
+                # Sent on the final, choice-less chunk
+                _annotate_usage(chunk.usage, "prompt_tokens", "completion_tokens")
+    except Exception as e:
+        logger.error(f"OpenAI API failed: {e}")
+        raise ValueError(f"LLM generation failed: {str(e)}") from e
+
+
+def _anthropic_stream(settings: Settings, system: str, user: str) -> Iterator[str]:
+    try:
+        import anthropic
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("anthropic package not installed") from e
+
+    if not settings.anthropic_api_key:
+        raise RuntimeError("Missing ANTHROPIC_API_KEY for Anthropic provider")
+
+    client = _client("anthropic", settings.anthropic_api_key, lambda key: anthropic.Anthropic(api_key=key))
+    logger.debug("Streaming Anthropic model %s", settings.llm_model)
+
+    try:
+        with client.messages.stream(
+            model=settings.llm_model,
+            max_tokens=_ANTHROPIC_MAX_TOKENS,
+            temperature=settings.llm_temperature,
+            system=system,
+            messages=[{"role": "user", "content": user}],
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+            _annotate_usage(stream.get_final_message().usage, "input_tokens", "output_tokens")
+    except Exception as e:
+        logger.error(f"Anthropic API failed: {e}")
+        raise ValueError(f"LLM generation failed: {str(e)}") from e
+
+
+async def _aopenai_chat(settings: Settings, system: str, user: str) -> str:
+    try:
+        from openai import AsyncOpenAI
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("openai package not installed") from e
+
+    if not settings.openai_api_key:
+        raise RuntimeError("Missing OPENAI_API_KEY for OpenAI provider")
+
+    client = _async_client("openai", settings.openai_api_key, lambda key: AsyncOpenAI(api_key=key))
+    logger.debug("Calling OpenAI model %s (async)", settings.llm_model)
+
+    try:
+        resp = await client.chat.completions.create(
+            model=settings.llm_model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=settings.llm_temperature,
+        )
+        _annotate_usage(resp.usage, "prompt_tokens", "completion_tokens")
+        return resp.choices[0].message.content or ""
+    except Exception as e:
+        logger.error(f"OpenAI API failed: {e}")
+        raise ValueError(f"LLM generation failed: {str(e)}") from e
+
+
+async def _aanthropic_chat(settings: Settings, system: str, user: str) -> str:
+    try:
+        import anthropic
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("anthropic package not installed") from e
+
+    if not settings.anthropic_api_key:
+        raise RuntimeError("Missing ANTHROPIC_API_KEY for Anthropic provider")
+
+    client = _async_client(
+        "anthropic", settings.anthropic_api_key, lambda key: anthropic.AsyncAnthropic(api_key=key)
+    )
+    logger.debug("Calling Anthropic model %s (async)", settings.llm_model)
+
+    try:
+        msg = await client.messages.create(
+            model=settings.llm_model,
+            max_tokens=_ANTHROPIC_MAX_TOKENS,
+            temperature=settings.llm_temperature,
+            system=system,
+            messages=[{"role": "user", "content": user}],
+        )
+        _annotate_usage(msg.usage, "input_tokens", "output_tokens")
+        parts: List[str] = []
+        for block in msg.content:
+            if getattr(block, "type", "") == "text":
+                parts.append(getattr(block, "text", ""))
+        return "".join(parts)
+    except Exception as e:
+        logger.error(f"Anthropic API failed: {e}")
+        raise ValueError(f"LLM generation failed: {str(e)}") from e
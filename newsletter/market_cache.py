@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_NEW_YORK = ZoneInfo("America/New_York")
+
+# Yahoo's daily bar settles shortly after the 16:00 ET close
+_SETTLE_GRACE = timedelta(minutes=15)
+_OPEN = (9, 30)
+
+
+def _in_session(now: datetime) -> bool:
+    """Whether ``now`` falls between a weekday's 09:30 ET open and its settle."""
+    now_et = now.astimezone(_NEW_YORK)
+    if now_et.weekday() >= 5:
+        return False
+    opened = now_et.replace(hour=_OPEN[0], minute=_OPEN[1], second=0, microsecond=0)
+    settle = now_et.replace(hour=16, minute=0, second=0, microsecond=0) + _SETTLE_GRACE
+    return opened <= now_et < settle
+
+
+def _last_settle(now: datetime) -> datetime:
+    """Most recent weekday 16:00 ET (plus grace) at or before ``now``."""
+    now_et = now.astimezone(_NEW_YORK)
+    settle = now_et.replace(hour=16, minute=0, second=0, microsecond=0) + _SETTLE_GRACE
+    if settle > now_et:
+        settle -= timedelta(days=1)
+    while settle.weekday() >= 5:  # Saturday/Sunday
+        settle -= timedelta(days=1)
+    return settle
+
+
+def exchange_time(data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Drop the timezone from a history's index, keeping exchange wall-clock time.
+
+    ``Ticker.history`` returns tz-aware bars and ``yf.download`` tz-naive ones
+    for the same series; every frame is stored and merged in the naive form
+    so the two can be combined.
+    """
+    if data is None or not isinstance(data.index, pd.DatetimeIndex) or data.index.tz is None:
+        return data
+    data = data.copy()
+    data.index = data.index.tz_localize(None)
+    return data
+
+
+def merge_history(cached: Optional[pd.DataFrame], fresh: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Combine a cached history with newly fetched rows; new rows win on overlap."""
+    cached, fresh = exchange_time(cached), exchange_time(fresh)
+    if cached is None or cached.empty:
+        return fresh
+    if fresh is None or fresh.empty:
+        return cached
+    merged = pd.concat([cached, fresh])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+class TimeSeriesCache:
+    """
+    On-disk cache of Yahoo Finance and FRED histories, one file per series.
+
+    Files are Parquet when pyarrow/fastparquet is installed, otherwise pandas
+    pickles. A file's mtime records when the series was last refreshed:
+
+    - Yahoo series are fresh within ``ttl`` seconds while the market is open.
+      Outside a session they are also fresh if refreshed after the latest US
+      market close, since nothing changes until the next open. Crypto pairs
+      (``*-USD``) trade around the clock, so only the TTL applies. Exchange
+      holidays are not modelled: a holiday weekday counts as a session, so
+      series are just refreshed on the TTL that day.
+    - FRED series are fresh within ``fred_ttl`` seconds; they publish at most
+      daily.
+
+    Stale series are refreshed by fetching only the tail since the last cached
+    date (see FinancialDataFetcher).
+    """
+
+    def __init__(self, root: str, ttl: float = 900, fred_ttl: float = 43200):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.ttl = ttl
+        self.fred_ttl = fred_ttl
+        os.makedirs(self.root, exist_ok=True)
+
+        try:
+            pd.io.parquet.get_engine("auto")
+            self._ext = "parquet"
+        except ImportError:
+            logger.info("pyarrow/fastparquet not installed - market cache uses pickle files")
+            self._ext = "pkl"
+
+    def _path(self, source: str, key: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9.=-]+", "_", key)
+        return os.path.join(self.root, source, f"{safe}.{self._ext}")
+
+    def read(self, source: str, key: str) -> Optional[pd.DataFrame]:
+        path = self._path(source, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            if self._ext == "parquet":
+                return exchange_time(pd.read_parquet(path))
+            return exchange_time(pd.read_pickle(path))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable market cache file {path}: {e}")
+            return None
+
+    def write(self, source: str, key: str, data: pd.DataFrame) -> None:
+        path = self._path(source, key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = exchange_time(data)
+            if self._ext == "parquet":
+                data.to_parquet(tmp)
+            else:
+                data.to_pickle(tmp)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Failed to write market cache file {path}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def is_fresh(self, source: str, key: str, now: Optional[datetime] = None) -> bool:
+        path = self._path(source, key)
+        try:
+            refreshed = os.path.getmtime(path)
+        except OSError:
+            return False
+
+        now = now or datetime.now(tz=_NEW_YORK)
+        age = now.timestamp() - refreshed
+        if source == "fred":
+            return age < self.fred_ttl
+        if age < self.ttl:
+            return True
+        if key.split("@")[0].endswith("-USD") or _in_session(now):
+            return False
+        # Outside a session the last settle is after the most recent open, so
+        # data refreshed since then has every bar there is
+        return datetime.fromtimestamp(refreshed, tz=_NEW_YORK) >= _last_settle(now)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from .config import Settings
+from .profiling import add_listener
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_metrics: Optional[Dict[str, Any]] = None
+_server_started = False
+
+# Span names (see profiling) that count as a market data network fetch, by source
+_MARKET_FETCH_SPANS = {"yahoo.history": "yahoo", "yahoo.download": "yahoo", "yahoo.info": "yahoo", "fred.fetch": "fred"}
+
+# Span names that report a cache outcome (a "cache" attribute, or per-lookup
+# counts for bulk spans, see _CACHE_COUNTS), by cache
+_CACHE_SPANS = {
+    "llm.chat": "llm",
+    "llm.stream": "llm",
+    "tavily.search": "search",
+    "market.stock_data": "market",
+    "market.stock_data_bulk": "market",
+    "market.fred": "market",
+    "chart.price": "chart",
+    "chart.comparison": "chart",
+    "chart.returns": "chart",
+}
+
+
+# Bulk span attributes counting several cache lookups, by result
+_CACHE_COUNTS = {"cache_hits": "hit", "cache_misses": "miss", "cache_stale": "stale"}
+
+# Span name prefixes reported as their own stage in newsletter_stage_errors; any
+# other span (e.g. an ad-hoc name) is counted as "other" to bound label cardinality
+_ERROR_STAGE_PREFIXES = ("pipeline.", "llm.", "tavily.", "market.", "yahoo.", "fred.", "chart.", "render.")
+_ERROR_STAGE_NAMES = {"run", "job"}
+
+
+def _error_stage(name: str) -> str:
+    if name in _ERROR_STAGE_NAMES or name.startswith(_ERROR_STAGE_PREFIXES):
+        return name
+    return "other"
+
+
+def _create_metrics() -> Optional[Dict[str, Any]]:
+    try:
+        from prometheus_client import Counter, Histogram
+    except ImportError:
+        logger.warning("prometheus-client not installed - metrics will be unavailable")
+        return None
+
+    return {
+        "llm_seconds": Histogram(
+            "newsletter_llm_request_seconds",
+            "LLM call latency (cache hits included, see the cache label)",
+            ["provider", "model", "cache"],
+            buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+        ),
+        "llm_tokens": Counter(
+            "newsletter_llm_tokens",
+            "Tokens consumed by LLM calls, as reported by the provider",
+            ["provider", "model", "direction"],
+        ),
+        "tavily_seconds": Histogram(
+            "newsletter_tavily_request_seconds",
+            "Tavily search latency",
+            ["cache"],
+            buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+        ),
+        "market_seconds": Histogram(
+            "newsletter_market_fetch_seconds",
+            "Yahoo Finance / FRED request latency",
+            ["source"],
+            buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+        ),
+        "chart_seconds": Histogram(
+            "newsletter_chart_render_seconds",
+            "Chart render time (cache hits included, see the cache label)",
+            ["kind", "cache"],
+            buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+        ),
+        "chart_bytes": Histogram(
+            "newsletter_chart_bytes",
+            "Rendered chart image size",
+            ["kind", "format"],
+            buckets=(5e3, 10e3, 20e3, 30e3, 50e3, 75e3, 100e3, 150e3, 250e3, 500e3),
+        ),
+        "cache_requests": Counter(
+            "newsletter_cache_requests",
+            "Cache lookups by outcome (hit, miss, stale)",
+            ["cache", "result"],
+        ),
+        "pipeline_seconds": Histogram(
+            "newsletter_pipeline_seconds",
+            "End-to-end newsletter generation time",
+            ["status"],
+            buckets=(5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600),
+        ),
+        "errors": Counter(
+            "newsletter_stage_errors",
+            "Spans that ended in an exception, by stage",
+            ["stage"],
+        ),
+    }
+
+
+def _observe(name: str, seconds: float, attrs: Dict[str, Any]) -> None:
+    """Profiling span listener: map finished spans onto the Prometheus metrics."""
+    m = _metrics
+    if name in ("llm.chat", "llm.stream"):
+        labels = (attrs.get("provider", ""), attrs.get("model", ""))
+        m["llm_seconds"].labels(*labels, attrs.get("cache", "off")).observe(seconds)
+        for direction in ("in", "out"):
+            tokens = attrs.get(f"tokens_{direction}")
+            if isinstance(tokens, int):
+                m["llm_tokens"].labels(*labels, direction).inc(tokens)
+    elif name == "tavily.search":
+        m["tavily_seconds"].labels(attrs.get("cache", "off")).observe(seconds)
+    elif name in _MARKET_FETCH_SPANS:
+        m["market_seconds"].labels(_MARKET_FETCH_SPANS[name]).observe(seconds)
+    elif name.startswith("chart."):
+        kind = name.split(".", 1)[1]
+        m["chart_seconds"].labels(kind, attrs.get("cache", "off")).observe(seconds)
+        if "format" in attrs and isinstance(attrs.get("bytes"), int):
+            m["chart_bytes"].labels(kind, attrs["format"]).observe(attrs["bytes"])
+    elif name == "pipeline.run":
+        m["pipeline_seconds"].labels("error" if "error" in attrs else "ok").observe(seconds)
+
+    cache = _CACHE_SPANS.get(name)
+    if cache is not None:
+        result = attrs.get("cache")
+        if result in ("hit", "miss", "stale"):
+            m["cache_requests"].labels(cache, result).inc()
+        for attr, result in _CACHE_COUNTS.items():
+            count = attrs.get(attr)
+            if isinstance(count, int) and count > 0:
+                m["cache_requests"].labels(cache, result).inc(count)
+    if "error" in attrs:
+        m["errors"].labels(_error_stage(name)).inc()
+
+
+def enable_metrics() -> bool:
+    """Start recording pipeline spans as Prometheus metrics. Returns False if prometheus-client is missing."""
+    global _metrics
+    with _lock:
+        if _metrics is None:
+            _metrics = _create_metrics()
+            if _metrics is None:
+                return False
+            add_listener(_observe)
+    return True
+
+
+def start_metrics_server(port: int, addr: str = "127.0.0.1") -> bool:
+    """Enable metrics and serve them at ``http://<addr>:<port>/metrics`` from a daemon thread."""
+    global _server_started
+    if not enable_metrics():
+        return False
+    with _lock:
+        if not _server_started:
+            from prometheus_client import start_http_server
+
+            start_http_server(port, addr=addr)
+            _server_started = True
+            logger.info(f"Serving metrics on http://{addr}:{port}/metrics")
+    return True
+
+
+def write_metrics_textfile(path: str) -> None:
+    """Write current metrics for the node_exporter textfile collector (atomically)."""
+    if _metrics is None:
+        return
+    from prometheus_client import REGISTRY, write_to_textfile
+
+    try:
+        write_to_textfile(path, REGISTRY)
+    except OSError as e:
+        logger.warning(f"Failed to write metrics textfile {path}: {e}")
+
+
+def configure_metrics(settings: Settings) -> bool:
+    """Enable metrics when METRICS_PORT or METRICS_TEXTFILE is set; start the HTTP endpoint if a port is."""
+    if settings.metrics_port:
+        return start_metrics_server(settings.metrics_port, addr=settings.metrics_addr)
+    if settings.metrics_textfile:
+        return enable_metrics()
+    return False
@@ -10,6 +10,11 @@ class FormInput(BaseModel):
     audience: str = Field(..., description="Target audience description")
 
 
+class BatchJob(FormInput):
+    id: Optional[str] = Field(default=None, description="Job id; also the output subdirectory name")
+    to: List[str] = Field(default_factory=list, description="Email recipients for this job")
+
+
 class SectionPlan(BaseModel):
     title: str
     description: Optional[str] = ""
@@ -1,31 +1,61 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import re
+import threading
+import time
 from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urlparse
-from typing import List, Dict, Tuple
+from functools import partial
+from typing import Callable, List, Dict, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, PackageLoader, select_autoescape
 
+from .checkpoint import RunCheckpoint
 from .config import Settings
-from .llm import chat_completion
+from .context import build_research_context
+from .llm import chat_completion, achat_completion, stream_chat_completion
 from .models import (
     FormInput,
     PlanOutput,
     SectionPlan,
     SectionDraft,
+    SearchResult,
     Newsletter,
 )
-from .search import tavily_search
-from .data import FinancialDataFetcher, format_market_summary, format_economic_indicators
-from .charts import ChartGenerator, embed_chart_in_html
+from .search import tavily_search, atavily_search
+from .research import assign_sources
+from .data import DEFAULT_SUMMARY_TICKERS, MarketDataStore, format_market_summary, format_economic_indicators
+from .market_cache import TimeSeriesCache
+from .cache import open_cache
+from .charts import (
+    ChartCache,
+    ChartGenerator,
+    ChartImageStore,
+    chart_image_dir,
+    embed_chart_in_html,
+    get_chart_renderer,
+)
+from .profiling import profiled, span, submit
 
 
 logger = logging.getLogger(__name__)
 
+# Chart generators by (CHART_WORKERS, CHART_CACHE_ENTRIES, CHART_CACHE_PATH)
+_chart_gens: Dict[tuple, ChartGenerator] = {}
+_chart_gens_lock = threading.Lock()
+
+# Jinja2 environments by (template_dir, template_cache_dir); each compiles a
+# template once and keeps it for the life of the process.
+_template_envs: Dict[Tuple[Optional[str], Optional[str]], Environment] = {}
+_template_envs_lock = threading.Lock()
+
+MAX_SECTIONS = 6
+
 
 PLAN_SYSTEM = (
     "# Overview\n"
@@ -72,37 +102,127 @@ def _ensure_json(text: str) -> PlanOutput:
     raise ValueError("Could not parse plan JSON from LLM output")
 
 
-def plan_sections(settings: Settings, form: FormInput) -> List[SectionPlan]:
-    user = (
+def _plan_prompt(form: FormInput) -> str:
+    return (
         f"Topic: {form.topic}\n"
         f"Tone: {form.tone}\n"
         f"Audience: {form.audience}\n\n"
         "Output JSON strictly like: {\n  \"newsletterSections\": [\n    {\"title\": \"...\", \"description\": \"...\"}\n  ]\n}"
     )
-    resp = chat_completion(settings, PLAN_SYSTEM, user)
+
+
+def _parse_plan(resp: str) -> List[SectionPlan]:
     plan = _ensure_json(resp)
     if not plan.newsletterSections:
         raise ValueError("No sections planned")
     logger.info("Planned %d sections", len(plan.newsletterSections))
-    # Cap at 6 sections to keep within word limits
-    return plan.newsletterSections[:6]
+    # Cap sections to keep within word limits
+    return plan.newsletterSections[:MAX_SECTIONS]
 
 
-def draft_section(settings: Settings, form: FormInput, section: SectionPlan) -> SectionDraft:
-    # Research via Tavily
-    query = f"{form.topic} — {section.title}. {section.description} Audience: {form.audience}."
-    results = tavily_search(settings, query)
-    # Build research context
-    research_lines = []
-    sources: List[str] = []
-    for i, r in enumerate(results, start=1):
-        research_lines.append(f"[Source {i}] URL: {r.url}\nTitle: {r.title or ''}\nContent: {r.content or ''}")
-        sources.append(str(r.url))
-    research_block = "\n\n".join(research_lines) if research_lines else "(no external sources available)"
+@profiled("pipeline.plan")
+def plan_sections(settings: Settings, form: FormInput) -> List[SectionPlan]:
+    resp = chat_completion(settings, PLAN_SYSTEM, _plan_prompt(form))
+    return _parse_plan(resp)
+
+
+class _PlanStreamParser:
+    """Incrementally pulls complete section objects out of a streamed plan JSON."""
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_str = False
+        self._escaped = False
+        self._obj_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[SectionPlan]:
+        self._buf += chunk
+        found: List[SectionPlan] = []
+        if self._done:
+            return found
+        if not self._in_array:
+            m = re.search(r'"newsletterSections"\s*:\s*\[', self._buf)
+            if not m:
+                return found
+            self._in_array = True
+            self._pos = m.end()
+
+        while self._pos < len(self._buf):
+            c = self._buf[self._pos]
+            if self._in_str:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_str = False
+            elif c == '"':
+                self._in_str = True
+            elif c == "{":
+                if self._depth == 0:
+                    self._obj_start = self._pos
+                self._depth += 1
+            elif c == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._obj_start is not None:
+                    try:
+                        found.append(SectionPlan(**json.loads(self._buf[self._obj_start:self._pos + 1])))
+                    except Exception:
+                        pass  # the full-text parse at the end is authoritative
+                    self._obj_start = None
+            elif c == "]" and self._depth == 0:
+                self._done = True
+                break
+            self._pos += 1
+        return found
+
+
+@profiled("pipeline.plan")
+def plan_sections_streaming(
+    settings: Settings,
+    form: FormInput,
+    on_section: Callable[[SectionPlan], None],
+) -> List[SectionPlan]:
+    """plan_sections that streams the plan and calls ``on_section`` as each section is parsed.
+
+    Lets callers start research for early sections while the LLM is still
+    writing later ones. The returned list comes from parsing the complete
+    response, exactly as plan_sections does.
+    """
+    parser = _PlanStreamParser()
+    text = ""
+    seen = 0
+    for chunk in stream_chat_completion(settings, PLAN_SYSTEM, _plan_prompt(form)):
+        text += chunk
+        for sec in parser.feed(chunk):
+            if seen < MAX_SECTIONS:
+                on_section(sec)
+            seen += 1
+    return _parse_plan(text)
+
+
+@profiled("pipeline.plan")
+async def aplan_sections(settings: Settings, form: FormInput) -> List[SectionPlan]:
+    resp = await achat_completion(settings, PLAN_SYSTEM, _plan_prompt(form))
+    return _parse_plan(resp)
+
+
+def _section_query(form: FormInput, section: SectionPlan) -> str:
+    return f"{form.topic} — {section.title}. {section.description} Audience: {form.audience}."
+
+
+def _section_prompt(settings: Settings, form: FormInput, section: SectionPlan, results: List[SearchResult]) -> str:
+    # Build research context, packed into the configured token budget
+    research_block, _ = build_research_context(settings, section, results)
+    research_block = research_block or "(no external sources available)"
 
     # Compose user prompt
     per_section_cap = settings.per_section_word_target
-    user = (
+    return (
         f"Section Title: {section.title}\n"
         f"Section Description: {section.description or ''}\n"
         f"Audience: {form.audience}\n"
@@ -111,7 +231,10 @@ def draft_section(settings: Settings, form: FormInput, section: SectionPlan) ->
         "Write 1-3 concise paragraphs. Include inline hyperlink citations for information that relies on research.\n\n"
         f"Research:\n{research_block}"
     )
-    html_body = chat_completion(settings, SECTION_SYSTEM, user).strip()
+
+
+def _section_draft(section: SectionPlan, html_body: str) -> SectionDraft:
+    html_body = html_body.strip()
 
     # Extract links from html for sources list; keep only absolute http(s) URLs
     urls = OrderedDict()
@@ -125,6 +248,101 @@ def draft_section(settings: Settings, form: FormInput, section: SectionPlan) ->
     return SectionDraft(title=section.title, html=html_body, sources=cleaned_sources or [])
 
 
+@profiled("pipeline.draft_section")
+def draft_section(
+    settings: Settings,
+    form: FormInput,
+    section: SectionPlan,
+    on_text: Optional[Callable[[str], None]] = None,
+    results: Optional[List[SearchResult]] = None,
+) -> SectionDraft:
+    """Research and write one section.
+
+    With ``on_text``, the LLM response is streamed and ``on_text`` is called
+    with the accumulated HTML after every chunk. Pass ``results`` (e.g. from
+    the shared research pool) to skip the section's own search.
+    """
+    # Research via Tavily
+    if results is None:
+        results = tavily_search(settings, _section_query(form, section))
+    user = _section_prompt(settings, form, section, results)
+    if on_text is None:
+        return _section_draft(section, chat_completion(settings, SECTION_SYSTEM, user))
+
+    text = ""
+    for chunk in stream_chat_completion(settings, SECTION_SYSTEM, user):
+        text += chunk
+        on_text(text)
+    return _section_draft(section, text)
+
+
+@profiled("pipeline.draft_section")
+async def adraft_section(
+    settings: Settings,
+    form: FormInput,
+    section: SectionPlan,
+    results: Optional[List[SearchResult]] = None,
+) -> SectionDraft:
+    if results is None:
+        results = await atavily_search(settings, _section_query(form, section))
+    user = _section_prompt(settings, form, section, results)
+    return _section_draft(section, await achat_completion(settings, SECTION_SYSTEM, user))
+
+
+@profiled("pipeline.research")
+def gather_research(
+    settings: Settings,
+    form: FormInput,
+    sections: List[SectionPlan],
+    pool: ThreadPoolExecutor,
+    prefetched: Optional[Dict[str, Future]] = None,
+) -> List[Optional[List[SearchResult]]]:
+    """Run every section's search concurrently (identical queries once) and collect the results.
+
+    Searches already started speculatively (``prefetched``, keyed by query)
+    are reused. With SHARED_RESEARCH the results are pooled by
+    assign_sources; otherwise each section keeps its own. A section whose
+    search failed gets None and searches again when drafted.
+    """
+    prefetched = prefetched or {}
+    queries = [_section_query(form, sec) for sec in sections]
+    futures = {
+        q: prefetched[q] if q in prefetched else submit(pool, tavily_search, settings, q)
+        for q in dict.fromkeys(queries)
+    }
+    outcomes = {q: _outcome(f) for q, f in futures.items()}
+    for q, outcome in outcomes.items():
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Search failed for '{q[:60]}': {outcome}")
+    results = [None if isinstance(outcomes[q], BaseException) else outcomes[q] for q in queries]
+    if not settings.shared_research:
+        return results
+    return assign_sources(sections, results, settings.tavily_max_results)
+
+
+@profiled("pipeline.research")
+async def agather_research(
+    settings: Settings,
+    form: FormInput,
+    sections: List[SectionPlan],
+    limit: asyncio.Semaphore,
+) -> List[Optional[List[SearchResult]]]:
+    """Async gather_research."""
+    queries = [_section_query(form, sec) for sec in sections]
+    unique = list(dict.fromkeys(queries))
+
+    async def _search(q: str) -> List[SearchResult]:
+        async with limit:
+            return await atavily_search(settings, q)
+
+    outcomes = dict(zip(unique, await asyncio.gather(*(_search(q) for q in unique), return_exceptions=True)))
+    for q, outcome in outcomes.items():
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Search failed for '{q[:60]}': {outcome}")
+    results = [None if isinstance(outcomes[q], BaseException) else outcomes[q] for q in queries]
+    return assign_sources(sections, results, settings.tavily_max_results)
+
+
 def _count_words(text: str) -> int:
     return len(re.findall(r"\b\w+\b", text))
 
@@ -150,25 +368,94 @@ def _extract_tickers_from_topic(topic: str) -> List[str]:
     return tickers
 
 
-def generate_market_data_section(settings: Settings, form: FormInput) -> SectionDraft:
+def _chart_cache(settings: Settings) -> Optional[ChartCache]:
+    disk = None
+    if settings.chart_cache_path:
+        try:
+            disk = open_cache(settings.chart_cache_path, ttl=settings.chart_cache_ttl, max_entries=settings.chart_cache_max_entries)
+        except Exception as e:
+            logger.warning(f"On-disk chart cache disabled: {e}")
+    if disk is None and settings.chart_cache_entries <= 0:
+        return None
+    return ChartCache(max_entries=settings.chart_cache_entries, disk=disk)
+
+
+def _get_chart_generator(settings: Settings) -> ChartGenerator:
+    key = (
+        settings.chart_workers,
+        settings.chart_cache_entries,
+        settings.chart_cache_path or None,
+        settings.chart_format,
+        settings.chart_dpi,
+        settings.chart_max_bytes,
+        settings.chart_image_mode,
+        chart_image_dir(settings),
+        settings.chart_image_url_prefix or None,
+    )
+    with _chart_gens_lock:
+        if key not in _chart_gens:
+            _chart_gens[key] = ChartGenerator(
+                renderer=get_chart_renderer(settings.chart_workers),
+                cache=_chart_cache(settings),
+                images=ChartImageStore(
+                    settings.chart_image_mode.lower(),
+                    directory=chart_image_dir(settings),
+                    url_prefix=settings.chart_image_url_prefix,
+                ),
+                format=settings.chart_format.lower(),
+                dpi=settings.chart_dpi,
+                max_bytes=settings.chart_max_bytes,
+            )
+        return _chart_gens[key]
+
+
+def create_market_store(settings: Settings) -> MarketDataStore:
+    """Per-run market data store backed by the on-disk cache when configured."""
+    cache = None
+    if settings.market_cache_dir:
+        try:
+            cache = TimeSeriesCache(
+                settings.market_cache_dir,
+                ttl=settings.market_cache_ttl,
+                fred_ttl=settings.fred_cache_ttl,
+            )
+        except OSError as e:
+            logger.warning(f"Market data cache disabled: {e}")
+    return MarketDataStore(cache=cache)
+
+
+@profiled("pipeline.market_section")
+def generate_market_data_section(
+    settings: Settings,
+    form: FormInput,
+    store: Optional[MarketDataStore] = None,
+) -> SectionDraft:
     """
     Generate a market data section with charts and metrics.
     Topic-aware: selects relevant tickers based on newsletter topic.
+    Pass a shared ``store`` to reuse downloads across sections and batch jobs.
     """
     logger.info("Generating market data section...")
 
-    fetcher = FinancialDataFetcher()
-    chart_gen = ChartGenerator()
+    fetcher = store if store is not None else create_market_store(settings)
+    chart_gen = _get_chart_generator(settings)
 
     # Extract relevant tickers from topic
     tickers = _extract_tickers_from_topic(form.topic)
     logger.info(f"Topic-aware tickers: {tickers}")
 
+    # Snapshot covers the major indices plus the topic tickers
+    summary_tickers = list(dict.fromkeys(DEFAULT_SUMMARY_TICKERS + tickers))
+
+    # Download everything up front in batched requests: the 3-month VIX window
+    # for the chart (the 5-day snapshot is sliced from it) and 5 days for the rest.
+    fetcher.prefetch({**{t: "5d" for t in summary_tickers}, "^VIX": "3mo"})
+
     # Always get VIX data for volatility chart
     vix_data = fetcher.get_stock_data("^VIX", period="3mo", interval="1d")
 
     # Get market summary
-    market_summary = fetcher.get_market_summary()
+    market_summary = fetcher.get_market_summary(summary_tickers)
     indicators = fetcher.get_economic_indicators()
 
     # Build HTML content
@@ -214,21 +501,82 @@ def generate_market_data_section(settings: Settings, form: FormInput) -> Section
     )
 
 
-def compose_subject(settings: Settings, form: FormInput, html_body: str) -> str:
+def _subject_prompt(form: FormInput, html_body: str) -> str:
     # Provide the newsletter body and context for subject generation
     snippet = re.sub(r"<[^>]+>", " ", html_body)
     snippet = re.sub(r"\s+", " ", snippet).strip()
-    user = (
+    return (
         f"Tone: {form.tone}\nAudience: {form.audience}\n"
         f"Newsletter excerpt: {snippet[:1500]}"
     )
-    subject = chat_completion(settings, TITLE_SYSTEM, user).strip()
+
+
+def _clean_subject(subject: str) -> str:
     # Title case-ish normalization
-    subject = subject.strip().strip('"').strip("'")
-    return subject
+    return subject.strip().strip('"').strip("'")
+
 
+@profiled("pipeline.subject")
+def compose_subject(settings: Settings, form: FormInput, html_body: str) -> str:
+    return _clean_subject(chat_completion(settings, TITLE_SYSTEM, _subject_prompt(form, html_body)))
+
+
+@profiled("pipeline.subject")
+async def acompose_subject(settings: Settings, form: FormInput, html_body: str) -> str:
+    return _clean_subject(await achat_completion(settings, TITLE_SYSTEM, _subject_prompt(form, html_body)))
+
+
+def get_template_environment(settings: Settings) -> Environment:
+    """
+    Shared Jinja2 environment for the configured template source.
 
-def render_html(settings: Settings, subject: str, sections: List[SectionDraft]) -> Tuple[str, Dict[str, str]]:
+    Templates load from the ``newsletter`` package unless TEMPLATE_DIR points
+    at a directory (which is then re-checked for edits). Package templates are
+    never re-checked, so each is compiled once per process; with
+    TEMPLATE_CACHE_DIR set, the compiled bytecode is also reused across
+    processes.
+    """
+    key = (settings.template_dir or None, settings.template_cache_dir or None)
+    with _template_envs_lock:
+        env = _template_envs.get(key)
+        if env is None:
+            template_dir, cache_dir = key
+            if template_dir:
+                loader = FileSystemLoader(os.path.expanduser(template_dir))
+            else:
+                loader = PackageLoader("newsletter", "templates")
+            bytecode_cache = None
+            if cache_dir:
+                try:
+                    cache_dir = os.path.expanduser(cache_dir)
+                    os.makedirs(cache_dir, exist_ok=True)
+                    bytecode_cache = FileSystemBytecodeCache(cache_dir)
+                except OSError as e:
+                    logger.warning(f"Template bytecode cache disabled: {e}")
+            env = Environment(
+                loader=loader,
+                autoescape=select_autoescape(["html", "xml"]),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                auto_reload=bool(template_dir),
+                bytecode_cache=bytecode_cache,
+            )
+            _template_envs[key] = env
+        return env
+
+
+def render_html(
+    settings: Settings,
+    subject: str,
+    sections: List[SectionDraft],
+    env: Optional[Environment] = None,
+    check_length: bool = True,
+) -> Tuple[str, Dict[str, str]]:
+    """Render the newsletter template; pass ``env`` to use a custom Jinja2 environment.
+
+    ``check_length=False`` skips the max_words warning, for intermediate renders
+    such as previews.
+    """
     # Aggregate sources from sections, preserving order and uniqueness (keys as strings)
     agg_sources: Dict[str, str] = OrderedDict()
     for s in sections:
@@ -240,46 +588,102 @@ def render_html(settings: Settings, subject: str, sections: List[SectionDraft])
     # Sort sources alphabetically by URL for stability
     agg_sources = OrderedDict(sorted(agg_sources.items(), key=lambda kv: kv[0]))
 
-    env = Environment(
-        loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
-        autoescape=select_autoescape(["html", "xml"]),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    tpl = env.get_template("newsletter.html.j2")
-    html_out = tpl.render(subject=subject, sections=sections, sources=agg_sources)
+    env = env or get_template_environment(settings)
+    with span("render.html", sections=len(sections)) as attrs:
+        tpl = env.get_template("newsletter.html.j2")
+        html_out = tpl.render(subject=subject, sections=sections, sources=agg_sources)
+        attrs["bytes"] = len(html_out.encode("utf-8"))
     # Word control: ensure content length
-    if _count_words(re.sub(r"<[^>]+>", " ", html_out)) > settings.max_words:
+    if check_length and _count_words(re.sub(r"<[^>]+>", " ", html_out)) > settings.max_words:
         logger.warning("Newsletter exceeds max_words; content may need trimming.")
     return html_out, agg_sources
 
 
-def run_pipeline(settings: Settings, form: FormInput) -> Newsletter:
-    sections = plan_sections(settings, form)
+def _collect_drafts(sections: List[SectionPlan], outcomes: List[object]) -> List[SectionDraft]:
+    """Keep successful drafts in plan order, logging and skipping sections that failed."""
     drafts: List[SectionDraft] = []
-    for sec in sections:
-        drafts.append(draft_section(settings, form, sec))
+    for sec, outcome in zip(sections, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Failed to draft section '{sec.title}': {outcome}")
+        else:
+            drafts.append(outcome)
+    if not drafts:
+        raise ValueError("All sections failed to draft")
+    return drafts
+
 
-    # Optionally add market data section
-    if settings.enable_market_data:
+def _market_index(settings: Settings, n_sections: int) -> int:
+    # Configured position (0=first, -1=last, etc.)
+    position = settings.market_data_position
+    if position == -1 or position >= n_sections:
+        return n_sections
+    return position
+
+
+def _insert_market_section(settings: Settings, drafts: List[SectionDraft], market_section: SectionDraft) -> None:
+    drafts.insert(_market_index(settings, len(drafts)), market_section)
+    logger.info(f"Added market data section at position {settings.market_data_position}")
+
+
+class PartialRenderer:
+    """
+    Rewrites a preview newsletter.html while sections are being drafted.
+
+    Sections show their streamed HTML so far, or a placeholder until their
+    first chunk arrives. Writes are throttled to one per ``min_interval``
+    seconds, except when a section completes. Safe to call from worker threads.
+    """
+
+    PLACEHOLDER = '<p class="drafting"><em>Drafting…</em></p>'
+
+    def __init__(self, settings: Settings, path: str, sections: List[SectionPlan], min_interval: float = 0.5):
+        self.settings = settings
+        self.path = path
+        self.min_interval = min_interval
+        self._titles = [sec.title for sec in sections]
+        self._html: List[Optional[str]] = [None] * len(sections)
+        self._market: Optional[SectionDraft] = None
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, index: int, html: str) -> None:
+        with self._lock:
+            self._html[index] = html
+            if time.monotonic() - self._last_write >= self.min_interval:
+                self._write()
+
+    def complete(self, index: int, draft: SectionDraft) -> None:
+        with self._lock:
+            self._html[index] = draft.html
+            self._write()
+
+    def set_market(self, draft: SectionDraft) -> None:
+        with self._lock:
+            self._market = draft
+            self._write()
+
+    def _write(self) -> None:
+        drafts = [
+            SectionDraft(title=title, html=html if html is not None else self.PLACEHOLDER)
+            for title, html in zip(self._titles, self._html)
+        ]
+        if self._market is not None:
+            drafts.insert(_market_index(self.settings, len(drafts)), self._market)
         try:
-            market_section = generate_market_data_section(settings, form)
-            # Insert at configured position (0=first, -1=last, etc.)
-            position = settings.market_data_position
-            if position == -1 or position >= len(drafts):
-                drafts.append(market_section)
-            else:
-                drafts.insert(position, market_section)
-            logger.info(f"Added market data section at position {position}")
+            html_out, _ = render_html(self.settings, "Drafting…", drafts, check_length=False)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(html_out)
+            os.replace(tmp, self.path)
         except Exception as e:
-            logger.warning(f"Failed to generate market data section: {e}")
-            # Continue without market data rather than failing entirely
+            logger.warning(f"Failed to write preview {self.path}: {e}")
+        self._last_write = time.monotonic()
 
-    # Compose subject after drafts, then render
+
+def _finalize(settings: Settings, form: FormInput, subject: str, drafts: List[SectionDraft]) -> Newsletter:
     # Use section titles to bias the subject as well
-    subject_hint = ", ".join(s.title for s in drafts)
-    subject = compose_subject(settings, form, "\n".join(d.html for d in drafts))
     if not subject:
+        subject_hint = ", ".join(s.title for s in drafts)
         subject = f"{form.topic.strip().title()} — {subject_hint[:60]}"
 
     html_out, sources = render_html(settings, subject, drafts)
@@ -288,3 +692,178 @@ def run_pipeline(settings: Settings, form: FormInput) -> Newsletter:
     sources = {str(k): ("" if v is None else str(v)) for k, v in (sources or {}).items()}
 
     return Newsletter(subject=subject, html=html_out, sources=sources)
+
+
+def _outcome(fut: Future) -> object:
+    try:
+        return fut.result()
+    except Exception as e:
+        return e
+
+
+def _completed(value: object) -> Future:
+    fut: Future = Future()
+    fut.set_result(value)
+    return fut
+
+
+def _stage(on_done: List[Callable[[object], None]], fn: Callable, *args: object) -> object:
+    """Run one pipeline stage and hand its result to each callback (checkpoint, preview)."""
+    result = fn(*args)
+    for callback in on_done:
+        callback(result)
+    return result
+
+
+@profiled("pipeline.run")
+def run_pipeline(
+    settings: Settings,
+    form: FormInput,
+    checkpoint: Optional[RunCheckpoint] = None,
+    preview_path: Optional[str] = None,
+) -> Newsletter:
+    """Plan, research, draft and render one newsletter.
+
+    With a ``checkpoint``, every completed stage (plan, each section, market
+    section, subject) is saved as it finishes, and stages already saved by an
+    earlier attempt of the same run are loaded instead of recomputed.
+
+    With a ``preview_path``, section drafts are streamed and a partial
+    newsletter is rewritten there as text arrives (see PartialRenderer).
+    """
+    # Fan out section drafting over a bounded pool; results are collected in
+    # plan order. The market section does not depend on the plan, so it starts
+    # before planning.
+    workers = max(1, settings.max_concurrency)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="draft") as pool:
+        market_future = None
+        if settings.enable_market_data:
+            saved_market = checkpoint.load_market() if checkpoint else None
+            if saved_market is not None:
+                market_future = _completed(saved_market)
+            else:
+                on_done = [checkpoint.save_market] if checkpoint else []
+                market_future = submit(pool, _stage, on_done, generate_market_data_section, settings, form)
+
+        # Speculative searches started while the plan is still streaming, by query
+        prefetched: Dict[str, Future] = {}
+
+        def _prefetch(sec: SectionPlan) -> None:
+            query = _section_query(form, sec)
+            if query not in prefetched:
+                prefetched[query] = submit(pool, tavily_search, settings, query)
+
+        sections = checkpoint.load_plan() if checkpoint else None
+        if sections is None:
+            if settings.speculative_planning:
+                sections = plan_sections_streaming(settings, form, _prefetch)
+            else:
+                sections = plan_sections(settings, form)
+            if checkpoint:
+                checkpoint.save_plan(sections)
+
+        preview = None
+        if preview_path:
+            preview = PartialRenderer(settings, preview_path, sections)
+            if market_future is not None:
+                def _preview_market(f: Future) -> None:
+                    # A failed market section is logged when the drafts are assembled
+                    if not f.cancelled() and f.exception() is None:
+                        preview.set_market(f.result())
+
+                market_future.add_done_callback(_preview_market)
+
+        saved_sections = [checkpoint.load_section(i) if checkpoint else None for i in range(len(sections))]
+        pending = [i for i, saved in enumerate(saved_sections) if saved is None]
+
+        # Search for every section up front so sources can be shared out
+        # (and to collect any speculative searches)
+        research: Dict[int, Optional[List[SearchResult]]] = {}
+        if pending and (settings.shared_research or prefetched):
+            pooled = gather_research(settings, form, [sections[i] for i in pending], pool, prefetched)
+            research = dict(zip(pending, pooled))
+
+        futures = []
+        for i, sec in enumerate(sections):
+            saved = saved_sections[i]
+            if saved is not None:
+                if preview:
+                    preview.complete(i, saved)
+                futures.append(_completed(saved))
+                continue
+            on_done = [partial(checkpoint.save_section, i)] if checkpoint else []
+            on_text = None
+            if preview:
+                on_done.append(partial(preview.complete, i))
+                on_text = partial(preview.update, i)
+            futures.append(submit(pool, _stage, on_done, draft_section, settings, form, sec, on_text, research.get(i)))
+        drafts = _collect_drafts(sections, [_outcome(f) for f in futures])
+
+        # Optionally add market data section
+        if market_future is not None:
+            try:
+                _insert_market_section(settings, drafts, market_future.result())
+            except Exception as e:
+                logger.warning(f"Failed to generate market data section: {e}")
+                # Continue without market data rather than failing entirely
+
+    # Compose subject after drafts, then render
+    subject = checkpoint.load_subject() if checkpoint else None
+    if subject is None:
+        subject = compose_subject(settings, form, "\n".join(d.html for d in drafts))
+        if checkpoint:
+            checkpoint.save_subject(subject)
+    return _finalize(settings, form, subject, drafts)
+
+
+@profiled("pipeline.run")
+async def arun_pipeline(
+    settings: Settings,
+    form: FormInput,
+    market_section: Optional[SectionDraft] = None,
+) -> Newsletter:
+    """Async run_pipeline: awaits search and LLM calls instead of blocking threads.
+
+    Many newsletters can be generated concurrently on one event loop, e.g.
+    ``await asyncio.gather(*(arun_pipeline(settings, f) for f in forms))``.
+    A precomputed ``market_section`` is used as-is instead of fetching again.
+    """
+    # Market data is sync-only (yfinance / FRED), so run it in a worker thread
+    # alongside planning; it does not depend on the plan.
+    market_task = None
+    if market_section is not None:
+        market_task = asyncio.create_task(asyncio.sleep(0, result=market_section))
+    elif settings.enable_market_data:
+        market_task = asyncio.create_task(asyncio.to_thread(generate_market_data_section, settings, form))
+
+    try:
+        sections = await aplan_sections(settings, form)
+
+        limit = asyncio.Semaphore(max(1, settings.max_concurrency))
+
+        research: List[Optional[List[SearchResult]]] = [None] * len(sections)
+        if settings.shared_research:
+            research = await agather_research(settings, form, sections, limit)
+
+        async def _bounded(sec: SectionPlan, results: Optional[List[SearchResult]]) -> SectionDraft:
+            async with limit:
+                return await adraft_section(settings, form, sec, results)
+
+        outcomes = await asyncio.gather(
+            *(_bounded(sec, results) for sec, results in zip(sections, research)),
+            return_exceptions=True,
+        )
+        drafts = _collect_drafts(sections, list(outcomes))
+    except BaseException:
+        if market_task is not None:
+            market_task.cancel()
+        raise
+
+    if market_task is not None:
+        try:
+            _insert_market_section(settings, drafts, await market_task)
+        except Exception as e:
+            logger.warning(f"Failed to generate market data section: {e}")
+
+    subject = await acompose_subject(settings, form, "\n".join(d.html for d in drafts))
+    return _finalize(settings, form, subject, drafts)
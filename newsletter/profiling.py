@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# The profile spans are recorded into, and the innermost open span (for annotate).
+# Context variables follow asyncio tasks and asyncio.to_thread automatically;
+# thread pools need submit() below.
+_active_profile: contextvars.ContextVar[Optional["RunProfile"]] = contextvars.ContextVar(
+    "newsletter_profile", default=None
+)
+_current_span: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "newsletter_span", default=None
+)
+
+# Callbacks (name, seconds, attrs) run for every finished span, profile or not;
+# used by the metrics exporter.
+_listeners: List[Callable[[str, float, Dict[str, Any]], None]] = []
+
+# Numeric span attributes summed per span name in the profile summary
+_TOTALED_ATTRS = ("bytes", "tokens_in", "tokens_out")
+
+
+class RunProfile:
+    """
+    Spans recorded during one newsletter run.
+
+    Each span has a name (e.g. ``llm.chat``, ``tavily.search``), start and
+    duration in seconds relative to the start of the run, the thread it ran
+    on, and free-form attributes such as ``bytes``, ``tokens_in``,
+    ``tokens_out`` and ``cache`` ("hit"/"miss"/"stale").
+    """
+
+    def __init__(self, name: str = "run"):
+        self.name = name
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, duration: float, attrs: Dict[str, Any]) -> None:
+        span = {
+            "name": name,
+            "start": round(start - self._t0, 6),
+            "seconds": round(duration, 6),
+            "thread": threading.current_thread().name,
+            "tid": threading.get_ident(),
+            "attrs": attrs,
+        }
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per span name: count, total/max seconds, summed bytes/tokens and cache outcomes."""
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = out.setdefault(span["name"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["total_seconds"] += span["seconds"]
+            entry["max_seconds"] = max(entry["max_seconds"], span["seconds"])
+            attrs = span["attrs"]
+            for attr in _TOTALED_ATTRS:
+                if isinstance(attrs.get(attr), (int, float)):
+                    entry[attr] = entry.get(attr, 0) + attrs[attr]
+            if "cache" in attrs:
+                outcomes = entry.setdefault("cache", {})
+                outcomes[attrs["cache"]] = outcomes.get(attrs["cache"], 0) + 1
+            if "error" in attrs:
+                entry["errors"] = entry.get("errors", 0) + 1
+        for entry in out.values():
+            entry["total_seconds"] = round(entry["total_seconds"], 6)
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]["total_seconds"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start"])
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "wall_seconds": round(time.perf_counter() - self._t0, 6),
+            "summary": self.summary(),
+            "spans": spans,
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format, loadable in chrome://tracing or Perfetto."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = [
+            {
+                "name": s["name"],
+                "cat": s["name"].split(".")[0],
+                "ph": "X",
+                "ts": round(s["start"] * 1e6),
+                "dur": round(s["seconds"] * 1e6),
+                "pid": pid,
+                "tid": s["tid"],
+                "args": s["attrs"],
+            }
+            for s in spans
+        ]
+        threads = {s["tid"]: s["thread"] for s in spans}
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str, chrome_trace: bool = False) -> List[Path]:
+        """Write ``path`` (JSON profile) and, optionally, ``<stem>.trace.json`` next to it."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.to_dict(), indent=2, default=str), encoding="utf-8")
+        written = [target]
+        if chrome_trace:
+            trace = target.with_name(f"{target.stem}.trace.json")
+            trace.write_text(json.dumps(self.to_chrome_trace(), default=str), encoding="utf-8")
+            written.append(trace)
+        return written
+
+
+@contextmanager
+def profile_run(name: str = "run", **attrs: Any) -> Iterator[RunProfile]:
+    """Record spans from this context (and tasks/threads it starts) into a new RunProfile.
+
+    ``name`` is also the root span's name, so keep it fixed (e.g. "run", "job")
+    and pass per-run identifiers as ``attrs`` on the root span.
+    """
+    profile = RunProfile(name)
+    token = _active_profile.set(profile)
+    try:
+        with span(name, **attrs):
+            yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+def active_profile() -> Optional[RunProfile]:
+    return _active_profile.get()
+
+
+def add_listener(listener: Callable[[str, float, Dict[str, Any]], None]) -> None:
+    """Call ``listener(name, seconds, attrs)`` whenever a span finishes."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed block as a span of the active profile.
+
+    Yields the span's attribute dict so the block can add ``bytes``,
+    ``tokens_in``/``tokens_out``, ``cache`` etc. Exceptions are recorded as an
+    ``error`` attribute and re-raised. Without an active profile or listener
+    this is a no-op.
+    """
+    with _timed(name, attrs, current=True):
+        yield attrs
+
+
+@contextmanager
+def detached_span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Like span(), but without making it the target of annotate().
+
+    For generators, which yield to their caller while the span is open: wrap
+    the generator's own work in ``span_scope(attrs)`` so it is annotated,
+    while whatever the caller does between items is not.
+    """
+    with _timed(name, attrs, current=False):
+        yield attrs
+
+
+@contextmanager
+def span_scope(attrs: Dict[str, Any]) -> Iterator[None]:
+    """Direct annotate() calls in the block to a detached span's ``attrs``."""
+    token = _current_span.set({"attrs": attrs})
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def _timed(name: str, attrs: Dict[str, Any], current: bool) -> Iterator[None]:
+    profile = _active_profile.get()
+    if profile is None and not _listeners:
+        yield
+        return
+
+    token = _current_span.set({"attrs": attrs}) if current else None
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        if token is not None:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # A generator closed from a different context; nothing to restore
+                pass
+        if profile is not None:
+            profile.record(name, start, duration, attrs)
+        for listener in _listeners:
+            try:
+                listener(name, duration, attrs)
+            except Exception as e:
+                logger.warning(f"Span listener failed for {name}: {e}")
+
+
+def annotate(**attrs: Any) -> None:
+    """Add attributes to the innermost open span, if any (e.g. token usage from deep in a call)."""
+    record = _current_span.get()
+    if record is not None:
+        record["attrs"].update(attrs)
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """Decorator form of span() for plain and async functions."""
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def submit(pool: Executor, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+    """pool.submit that carries the caller's context (and so its profile) into the worker thread."""
+    ctx = contextvars.copy_context()
+    return pool.submit(ctx.run, fn, *args, **kwargs)
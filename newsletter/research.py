@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .context import relevance_scores, section_terms
+from .models import SearchResult, SectionPlan
+
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the click and never change the page: these
+# exact names, plus anything starting with utm_
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid"})
+_TRACKING_PREFIX = "utm_"
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in _TRACKING_PARAMS or name.startswith(_TRACKING_PREFIX)
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so the same article found by different searches compares equal."""
+    parts = urlsplit(str(url))
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(k)
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def assign_sources(
+    sections: List[SectionPlan],
+    results_by_section: List[Optional[List[SearchResult]]],
+    per_section: int,
+) -> List[Optional[List[SearchResult]]]:
+    """
+    Pool every section's search results and hand each unique source to one section.
+
+    Results are deduplicated by canonical URL, and each source goes to the
+    section it is most relevant to (ties favour the section whose search
+    found it first), keeping at most ``per_section`` per section. A section
+    left with nothing falls back to its own top results, so every section
+    still has research. Sections whose search failed (``None``) stay ``None``.
+    """
+    unique: Dict[str, SearchResult] = {}
+    origin: Dict[str, int] = {}
+    for i, results in enumerate(results_by_section):
+        for r in results or []:
+            key = canonical_url(r.url)
+            if key not in unique:
+                unique[key] = r
+                origin[key] = i
+
+    keys = list(unique)
+    docs = [f"{unique[k].title or ''} {unique[k].content or ''}" for k in keys]
+    scores = [
+        relevance_scores(section_terms(sec), docs) if results_by_section[i] is not None else None
+        for i, sec in enumerate(sections)
+    ]
+
+    ranked: List[List[tuple]] = [[] for _ in sections]
+    for j, key in enumerate(keys):
+        best = max(
+            (i for i in range(len(sections)) if scores[i] is not None),
+            key=lambda i: (scores[i][j], i == origin[key]),
+        )
+        ranked[best].append((scores[best][j], unique[key]))
+
+    assigned: List[Optional[List[SearchResult]]] = []
+    for i, results in enumerate(results_by_section):
+        if results is None:
+            assigned.append(None)
+            continue
+        picked = [r for _, r in sorted(ranked[i], key=lambda t: -t[0])[:per_section]]
+        assigned.append(picked or list(results[:per_section]))
+
+    total = sum(len(r) for r in results_by_section if r)
+    logger.info(f"Research pool: {total} results, {len(unique)} unique sources across {len(sections)} sections")
+    return assigned
@@ -1,51 +1,94 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
-import os
-from typing import List
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
 
+import httpx
 import requests
+import requests.adapters
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from .config import Settings
 from .models import SearchResult
+from .cache import SQLiteCache, open_cache
+from .profiling import span
 
 
 logger = logging.getLogger(__name__)
 
+# Process-wide Session so Tavily calls reuse keep-alive connections.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
 
-def _cache_path(settings: Settings, query: str) -> str:
-    os.makedirs(".cache/tavily", exist_ok=True)
-    key = hashlib.sha256(query.encode("utf-8")).hexdigest()
-    return os.path.join(".cache/tavily", f"{key}.json")
+# Part of every search cache key; bump to invalidate entries when result
+# parsing changes.
+_CACHE_VERSION = "v1"
 
+# One AsyncClient per event loop so concurrent searches share a connection pool.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8), reraise=True,
-       retry=retry_if_exception_type(requests.RequestException))
-def tavily_search(settings: Settings, query: str) -> List[SearchResult]:
-    """Search Tavily with simple on-disk caching."""
-    cache_file = _cache_path(settings, query)
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cached = json.load(f)
-                return [SearchResult(**r) for r in cached]
-        except Exception:
-            pass
-
-    if not settings.tavily_api_key:
-        logger.warning("No TAVILY_API_KEY set; returning empty results for query: %s", query)
-        return []
-
-    payload = {
+
+def get_search_cache(settings: Settings) -> Optional[SQLiteCache]:
+    """Process-wide search cache for the configured path, or None when disabled."""
+    if not settings.search_cache_path:
+        return None
+    return open_cache(
+        settings.search_cache_path,
+        ttl=settings.search_cache_ttl,
+        max_entries=settings.search_cache_max_entries,
+    )
+
+
+def _cache_key(settings: Settings, query: str) -> str:
+    """Hash of the full effective request (minus the API key), namespaced by version.
+
+    Any parameter that changes the request (max results, depth, topic,
+    domains, endpoint) yields a different key, so only the affected searches
+    miss. Bump _CACHE_VERSION when the way results are parsed changes.
+    """
+    payload = _build_payload(settings, query)
+    payload.pop("api_key", None)
+    payload["endpoint"] = settings.tavily_endpoint
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"tavily:{_CACHE_VERSION}:{digest}"
+
+
+def _read_cache(settings: Settings, query: str) -> Optional[List[SearchResult]]:
+    try:
+        cache = get_search_cache(settings)
+        cached = cache.get(_cache_key(settings, query)) if cache is not None else None
+        if cached is not None:
+            return [SearchResult(**r) for r in json.loads(cached)]
+    except Exception as e:
+        logger.warning(f"Search cache read failed: {e}")
+    return None
+
+
+def _write_cache(settings: Settings, query: str, results: List[SearchResult]) -> None:
+    try:
+        cache = get_search_cache(settings)
+        if cache is not None:
+            cache.set(_cache_key(settings, query), json.dumps([r.model_dump(mode="json") for r in results]))
+    except Exception as e:
+        logger.warning(f"Search cache write failed: {e}")
+
+
+def _build_payload(settings: Settings, query: str) -> Dict[str, Any]:
+    return {
         "api_key": settings.tavily_api_key,
         "query": query[:400],  # Truncate query to avoid API limits
         "search_depth": "advanced",  # Use advanced search for better quality
         "include_answer": True,
         "topic": "news",
-        "include_raw_content": True,
+        "include_raw_content": False,  # Only the extracted content is used in prompts
         "max_results": settings.tavily_max_results,
         "include_domains": [  # Focus on quant-specific sources
             "arxiv.org",
@@ -60,9 +103,9 @@ def tavily_search(settings: Settings, query: str) -> List[SearchResult]:
             "seekingalpha.com"
         ]
     }
-    resp = requests.post(settings.tavily_endpoint, json=payload, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+
+
+def _parse_results(settings: Settings, data: Dict[str, Any]) -> List[SearchResult]:
     results = []
     for item in data.get("results", [])[: settings.tavily_max_results]:
         results.append(
@@ -72,12 +115,87 @@ def tavily_search(settings: Settings, query: str) -> List[SearchResult]:
                 content=item.get("content") or None,
             )
         )
+    return results
 
-    # write cache
-    try:
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump([r.model_dump() for r in results], f)
-    except Exception:
-        pass
 
-    return results
+def _get_session(settings: Settings) -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=settings.http_pool_size
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8), reraise=True,
+       retry=retry_if_exception_type(requests.RequestException))
+def tavily_search(settings: Settings, query: str) -> List[SearchResult]:
+    """Search Tavily, serving repeat queries from the SQLite search cache."""
+    with span("tavily.search", query=query[:80]) as attrs:
+        cached = _read_cache(settings, query)
+        if cached is not None:
+            attrs.update(cache="hit", results=len(cached))
+            return cached
+        attrs["cache"] = "miss" if settings.search_cache_path else "off"
+
+        if not settings.tavily_api_key:
+            logger.warning("No TAVILY_API_KEY set; returning empty results for query: %s", query)
+            return []
+
+        payload = _build_payload(settings, query)
+        resp = _get_session(settings).post(settings.tavily_endpoint, json=payload, timeout=30)
+        attrs.update(status=resp.status_code, bytes=len(resp.content))
+        resp.raise_for_status()
+        results = _parse_results(settings, resp.json())
+        attrs["results"] = len(results)
+
+        # write cache
+        _write_cache(settings, query, results)
+
+        return results
+
+
+def _get_async_client(settings: Settings) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=settings.http_pool_size,
+            max_keepalive_connections=settings.http_pool_size,
+        )
+        client = httpx.AsyncClient(timeout=30, limits=limits)
+        _async_clients[loop] = client
+    return client
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8), reraise=True,
+       retry=retry_if_exception_type(httpx.HTTPError))
+async def atavily_search(settings: Settings, query: str) -> List[SearchResult]:
+    """Async counterpart of tavily_search sharing the same search cache."""
+    with span("tavily.search", query=query[:80]) as attrs:
+        # SQLite cache I/O runs in a thread so it doesn't block other coroutines
+        cached = await asyncio.to_thread(_read_cache, settings, query)
+        if cached is not None:
+            attrs.update(cache="hit", results=len(cached))
+            return cached
+        attrs["cache"] = "miss" if settings.search_cache_path else "off"
+
+        if not settings.tavily_api_key:
+            logger.warning("No TAVILY_API_KEY set; returning empty results for query: %s", query)
+            return []
+
+        payload = _build_payload(settings, query)
+        resp = await _get_async_client(settings).post(settings.tavily_endpoint, json=payload)
+        attrs.update(status=resp.status_code, bytes=len(resp.content))
+        resp.raise_for_status()
+        results = _parse_results(settings, resp.json())
+        attrs["results"] = len(results)
+
+        await asyncio.to_thread(_write_cache, settings, query, results)
+
+        return results
@@ -0,0 +1,66 @@
+import time
+
+from newsletter import cache as cache_module
+from newsletter.cache import SQLiteCache
+
+
+def _rows(cache) -> int:
+    return cache._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def test_get_returns_stored_value(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "c.sqlite3"))
+    cache.set("a", "1")
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entries_miss_and_are_removed(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / "c.sqlite3"), ttl=60)
+    cache.set("a", "1")
+    later = time.time() + 61
+    monkeypatch.setattr(cache_module.time, "time", lambda: later)
+    assert cache.get("a") is None
+    assert _rows(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: clock[0])
+    cache = SQLiteCache(str(tmp_path / "c.sqlite3"), max_entries=2)
+    for key in ("a", "b"):
+        clock[0] += 1
+        cache.set(key, key)
+    clock[0] += 1
+    cache.get("a")
+    clock[0] += 1
+    cache.set("c", "c")
+
+    assert _rows(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_replacing_a_key_does_not_count_twice(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "c.sqlite3"), max_entries=2)
+    for _ in range(5):
+        cache.set("a", "1")
+    cache.set("b", "2")
+    assert _rows(cache) == 2
+    assert cache.stats()["evictions"] == 0
+
+
+def test_sweep_resyncs_count_with_other_writers(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "_SWEEP_EVERY", 4)
+    path = str(tmp_path / "c.sqlite3")
+    cache = SQLiteCache(path, max_entries=3)
+    other = SQLiteCache(path, max_entries=100)
+    for key in ("x", "y", "z"):
+        other.set(key, key)
+    for key in ("a", "b", "c", "d"):
+        cache.set(key, key)
+    assert _rows(cache) == 3
+    assert cache._count == 3
@@ -0,0 +1,64 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from newsletter.charts import ChartRenderer, ChartSeries, ChartSpec, decimate_line
+
+
+def _spec(**options) -> ChartSpec:
+    return ChartSpec(kind="line", series=[ChartSeries(y=np.arange(10.0))], figsize=(2, 2), dpi=50, **options)
+
+
+def test_renderer_rerenders_in_process_when_pool_breaks():
+    renderer = ChartRenderer(workers=2)
+    broken: Future = Future()
+    broken.set_exception(BrokenProcessPool("worker died"))
+
+    image = renderer.result(broken, _spec())
+    assert image.startswith(b"\x89PNG")
+    assert renderer.workers == 0
+    assert renderer._get_pool() is None
+
+
+def test_renderer_without_workers_renders_in_process():
+    renderer = ChartRenderer()
+    assert renderer.render(_spec(format="svg")).lstrip().startswith(b"<?xml")
+
+
+def test_decimate_line_keeps_small_series_unchanged():
+    x = np.arange(40.0)
+    y = np.sin(x)
+    dx, dy = decimate_line(x, y, buckets=10)
+    assert dx is x and dy is y
+
+
+def test_decimate_line_keeps_extremes_and_endpoints_per_column():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000.0)
+    y = rng.normal(size=x.size).cumsum()
+    buckets = 50
+
+    dx, dy = decimate_line(x, y, buckets)
+
+    assert len(dx) <= 4 * buckets
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert np.all(np.diff(dx) > 0)
+    edges = np.linspace(x[0], x[-1], buckets + 1)
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        full = y[(x >= lo) & (x < hi)]
+        kept = dy[(dx >= lo) & (dx < hi)]
+        if full.size:
+            assert kept.min() == full.min() and kept.max() == full.max()
+
+
+def test_decimate_line_handles_dates_and_keeps_gaps():
+    x = np.arange("2020-01-01", "2026-01-01", dtype="datetime64[D]")
+    y = np.linspace(0.0, 1.0, x.size)
+    y[500] = np.nan
+
+    dx, dy = decimate_line(x, y, buckets=20)
+
+    assert dx.dtype == x.dtype
+    assert len(dx) <= 4 * 20 + 1
+    assert np.isnan(dy).sum() == 1
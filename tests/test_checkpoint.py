@@ -0,0 +1,63 @@
+import pytest
+
+from newsletter import pipeline
+from newsletter.checkpoint import RunCheckpoint
+from newsletter.config import Settings
+from newsletter.models import FormInput, SectionDraft, SectionPlan
+
+FORM = FormInput(topic="Factor investing", tone="Professional", audience="Quants")
+PLAN = [SectionPlan(title="Value", description="v"), SectionPlan(title="Momentum", description="m")]
+
+
+def test_round_trips_every_stage(tmp_path):
+    checkpoint = RunCheckpoint.create(str(tmp_path), FORM)
+    draft = SectionDraft(title="Value", html="<p>v</p>", sources=["https://example.com/v"])
+    checkpoint.save_plan(PLAN)
+    checkpoint.save_section(0, draft)
+    checkpoint.save_subject("Subject")
+
+    resumed = RunCheckpoint.resume(str(tmp_path), checkpoint.run_id)
+    assert resumed.load_form() == FORM
+    assert resumed.load_plan() == PLAN
+    assert resumed.load_section(0) == draft
+    assert resumed.load_section(1) is None
+    assert resumed.load_market() is None
+    assert resumed.load_subject() == "Subject"
+
+
+def test_resume_unknown_run_fails(tmp_path):
+    with pytest.raises(ValueError):
+        RunCheckpoint.resume(str(tmp_path), "missing")
+
+
+def test_discard_removes_the_run_directory(tmp_path):
+    checkpoint = RunCheckpoint.create(str(tmp_path), FORM)
+    checkpoint.discard()
+    assert not checkpoint.path.exists()
+
+
+def test_run_pipeline_resumes_only_unfinished_stages(tmp_path, monkeypatch):
+    checkpoint = RunCheckpoint.create(str(tmp_path), FORM)
+    checkpoint.save_plan(PLAN)
+    checkpoint.save_section(0, SectionDraft(title="Value", html="<p>saved value</p>"))
+
+    drafted = []
+
+    def fake_draft(settings, form, section, on_text=None, research=None):
+        drafted.append(section.title)
+        return SectionDraft(title=section.title, html=f"<p>new {section.title}</p>")
+
+    def no_plan(*args, **kwargs):
+        raise AssertionError("plan was already checkpointed")
+
+    monkeypatch.setattr(pipeline, "draft_section", fake_draft)
+    monkeypatch.setattr(pipeline, "plan_sections", no_plan)
+    monkeypatch.setattr(pipeline, "compose_subject", lambda settings, form, text: "Factor notes")
+    settings = Settings(_env_file=None, enable_market_data=False, template_cache_dir=None, max_words=10000)
+
+    newsletter = pipeline.run_pipeline(settings, FORM, checkpoint=checkpoint)
+
+    assert drafted == ["Momentum"]
+    assert "saved value" in newsletter.html and "new Momentum" in newsletter.html
+    assert checkpoint.load_section(1).html == "<p>new Momentum</p>"
+    assert checkpoint.load_subject() == "Factor notes"
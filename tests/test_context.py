@@ -0,0 +1,51 @@
+from newsletter.config import Settings
+from newsletter.context import build_research_context, estimate_tokens, relevance_scores
+from newsletter.models import SearchResult, SectionPlan
+
+SECTION = SectionPlan(title="Volatility targeting", description="How volatility targeting performed")
+
+
+def _settings(**overrides) -> Settings:
+    return Settings(_env_file=None, llm_provider="anthropic", **overrides)
+
+
+def _result(url, content):
+    return SearchResult(url=url, title="T", content=content)
+
+
+def test_relevance_scores_rank_matching_passages_first():
+    scores = relevance_scores(["volatility", "targeting"], [
+        "Dividend stocks rallied on earnings.",
+        "Volatility targeting cut exposure as volatility spiked.",
+    ])
+    assert scores[1] > scores[0] == 0.0
+
+
+def test_zero_budget_keeps_every_source_in_full():
+    results = [_result("https://a.com/", "First."), _result("https://b.com/", "Second.")]
+    block, sources = build_research_context(_settings(research_token_budget=0), SECTION, results)
+    assert sources == results
+    assert block == (
+        "[Source 1] URL: https://a.com/\nTitle: T\nContent: First.\n\n"
+        "[Source 2] URL: https://b.com/\nTitle: T\nContent: Second."
+    )
+
+
+def test_budget_keeps_most_relevant_passages_within_limit():
+    filler = "Dividend stocks rallied after strong quarterly earnings across sectors. " * 8
+    relevant = "Volatility targeting funds cut exposure when volatility spiked. "
+    results = [_result("https://a.com/", filler), _result("https://b.com/", relevant)]
+    settings = _settings()
+
+    block, sources = build_research_context(settings, SECTION, results, budget=40)
+
+    assert [str(s.url) for s in sources] == ["https://b.com/"]
+    assert block.startswith("[Source 1] URL: https://b.com/")
+    assert estimate_tokens(settings, block) <= 40
+
+
+def test_near_duplicate_passages_are_dropped():
+    text = "Volatility targeting funds cut equity exposure sharply in March as realized volatility spiked."
+    results = [_result("https://a.com/", text), _result("https://b.com/", text + " Reuters")]
+    _, sources = build_research_context(_settings(), SECTION, results, budget=1000)
+    assert [str(s.url) for s in sources] == ["https://a.com/"]
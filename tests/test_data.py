@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from newsletter import data as data_module
+from newsletter.data import ECONOMIC_INDICATORS, FinancialDataFetcher, MarketDataStore, _slice_period
+from newsletter.market_cache import TimeSeriesCache
+
+MID_YEAR = datetime(2026, 7, 15, 12, 0)
+
+
+class _MidYear(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return MID_YEAR
+
+
+def _daily(start, end):
+    index = pd.bdate_range(start, end)
+    return pd.DataFrame({"Close": range(len(index))}, index=index, dtype=float)
+
+
+def test_slice_period_ytd_starts_at_new_year():
+    data = _daily("2025-06-02", "2026-10-16")
+    sliced = _slice_period(data, "ytd")
+    assert sliced.index[0] == pd.Timestamp("2026-01-01")
+
+
+def test_slice_period_day_periods_count_sessions():
+    data = _daily("2026-09-01", "2026-10-16")
+    assert len(_slice_period(data, "5d")) == 5
+
+
+def test_store_ytd_window_does_not_cover_one_year(monkeypatch):
+    # _period_days("ytd") reads the clock; pin it so early January can't flip the 5d check
+    monkeypatch.setattr(data_module, "datetime", _MidYear)
+    store = MarketDataStore()
+    today = pd.Timestamp(MID_YEAR).normalize()
+    store._history[("SPY", "1d")] = ("ytd", _daily(today.replace(month=1, day=1), today))
+    assert store._cached("SPY", "1y", "1d") is None
+    assert store._cached("SPY", "5d", "1d") is not None
+
+
+def test_store_longer_window_serves_shorter_one():
+    store = MarketDataStore()
+    today = pd.Timestamp.now().normalize()
+    data = _daily(today - pd.DateOffset(years=1), today)
+    store._history[("SPY", "1d")] = ("1y", data)
+    sliced = store._cached("SPY", "3mo", "1d")
+    assert sliced.index[-1] == data.index[-1]
+    assert sliced.index[0] > data.index[-1] - pd.DateOffset(months=3)
+
+
+def test_store_retries_partial_economic_indicators(monkeypatch):
+    results = [
+        {"CPI": {"value": 1.0}},
+        {name: {"value": 1.0} for name in ECONOMIC_INDICATORS.values()},
+    ]
+    calls = []
+
+    def fake(self, timeout=10, max_workers=4):
+        calls.append(timeout)
+        return results[len(calls) - 1]
+
+    monkeypatch.setattr(FinancialDataFetcher, "get_economic_indicators", fake)
+    store = MarketDataStore()
+    assert len(store.get_economic_indicators()) == 1
+    assert len(store.get_economic_indicators()) == len(ECONOMIC_INDICATORS)
+    store.get_economic_indicators()
+    assert len(calls) == 2
+
+
+def test_fred_refetches_when_cached_series_does_not_merge(tmp_path, monkeypatch):
+    cache = TimeSeriesCache(str(tmp_path))
+    cache.write("fred", "DGS10", _daily("2025-01-01", "2026-09-30"))
+    fetcher = FinancialDataFetcher(cache)
+    fetcher._fred_available = True
+    fresh = _daily("2025-10-01", "2026-10-16")
+    fetched = []
+
+    def fake_fetch(series_id, start, end, timeout):
+        fetched.append(start)
+        return fresh
+
+    def no_merge(cached, new):
+        raise ValueError("incompatible")
+
+    monkeypatch.setattr(fetcher, "_fetch_fred", fake_fetch)
+    monkeypatch.setattr(cache, "is_fresh", lambda source, key: False)
+    monkeypatch.setattr(data_module, "merge_history", no_merge)
+
+    result = fetcher.get_fred_data("DGS10", start=datetime.now() - timedelta(days=365))
+    assert result is fresh
+    assert len(fetched) == 2  # tail, then the full window
+    assert len(cache.read("fred", "DGS10")) == len(fresh)
@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+
+from newsletter import emailer
+from newsletter.config import Settings
+
+
+class _FakeSMTP:
+    sent = []
+
+    def __init__(self, host, port):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def send_message(self, msg):
+        self.sent.append(msg)
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    _FakeSMTP.sent = []
+    monkeypatch.setattr(emailer.smtplib, "SMTP", _FakeSMTP)
+    return _FakeSMTP.sent
+
+
+def _settings(tmp_path, **overrides) -> Settings:
+    return Settings(
+        _env_file=None,
+        smtp_host="smtp.example.com",
+        smtp_username="user",
+        smtp_password="secret",
+        smtp_from="news@example.com",
+        output_dir=str(tmp_path),
+        **overrides,
+    )
+
+
+def test_cid_mode_attaches_charts_from_default_image_dir(tmp_path, smtp):
+    (tmp_path / "charts").mkdir()
+    (tmp_path / "charts" / "abc.png").write_bytes(b"\x89PNG")
+    html = f'<img src="cid:abc.png@{emailer.CID_DOMAIN}">'
+
+    emailer.send_email(_settings(tmp_path, chart_image_mode="cid"), "Subject", html, ["a@example.com"])
+
+    attachments = [part for part in smtp[0].walk() if part.get_content_type() == "image/png"]
+    assert len(attachments) == 1
+    assert attachments[0]["Content-ID"] == f"<abc.png@{emailer.CID_DOMAIN}>"
+
+
+def test_file_mode_without_url_prefix_warns(tmp_path, smtp, caplog):
+    with caplog.at_level(logging.WARNING, logger=emailer.__name__):
+        emailer.send_email(_settings(tmp_path, chart_image_mode="file"), "Subject", "<p></p>", ["a@example.com"])
+    assert "CHART_IMAGE_URL_PREFIX" in caplog.text
+    assert len(smtp) == 1
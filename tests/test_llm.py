@@ -0,0 +1,28 @@
+from newsletter import llm
+from newsletter.config import Settings
+from newsletter.profiling import annotate, profile_run
+
+
+def test_stream_span_is_not_current_between_chunks(monkeypatch):
+    def fake_stream(settings, system, user):
+        annotate(tokens_in=3)
+        yield "Hello, "
+        yield "world"
+        annotate(tokens_out=2)
+
+    monkeypatch.setattr(llm, "_openai_stream", fake_stream)
+    settings = Settings(_env_file=None, llm_provider="openai", llm_cache_mode="off")
+
+    with profile_run("run") as profile:
+        chunks = []
+        for chunk in llm.stream_chat_completion(settings, "system", "user"):
+            annotate(consumer=True)
+            chunks.append(chunk)
+
+    assert "".join(chunks) == "Hello, world"
+    (stream,) = [s for s in profile.spans if s["name"] == "llm.stream"]
+    assert stream["attrs"]["tokens_in"] == 3
+    assert stream["attrs"]["tokens_out"] == 2
+    assert "consumer" not in stream["attrs"]
+    (root,) = [s for s in profile.spans if s["name"] == "run"]
+    assert root["attrs"]["consumer"] is True
@@ -0,0 +1,97 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from newsletter.market_cache import TimeSeriesCache, merge_history
+
+NEW_YORK = "America/New_York"
+
+
+def _et(*args) -> datetime:
+    return pd.Timestamp(datetime(*args), tz=NEW_YORK).to_pydatetime()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TimeSeriesCache(str(tmp_path), ttl=900, fred_ttl=43200)
+
+
+def _refreshed(cache, source, key, when):
+    frame = pd.DataFrame({"Close": [1.0]}, index=pd.DatetimeIndex(["2026-10-05"]))
+    cache.write(source, key, frame)
+    stamp = when.timestamp()
+    os.utime(cache._path(source, key), (stamp, stamp))
+
+
+# 2026-10-06 is a Tuesday
+def test_open_market_uses_ttl_only(cache):
+    _refreshed(cache, "yahoo", "SPY@1d", _et(2026, 10, 6, 10, 0))
+    assert cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 6, 10, 10))
+    assert not cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 6, 14, 0))
+
+
+def test_open_market_ignores_refresh_after_previous_settle(cache):
+    _refreshed(cache, "yahoo", "SPY@1d", _et(2026, 10, 5, 17, 0))
+    assert not cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 6, 14, 0))
+
+
+def test_after_close_fresh_once_refreshed_after_settle(cache):
+    _refreshed(cache, "yahoo", "SPY@1d", _et(2026, 10, 6, 16, 30))
+    assert cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 6, 22, 0))
+    # Before the next open nothing new has printed
+    assert cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 7, 8, 0))
+    assert not cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 7, 10, 0))
+
+
+def test_after_close_stale_if_refreshed_before_settle(cache):
+    _refreshed(cache, "yahoo", "SPY@1d", _et(2026, 10, 6, 15, 0))
+    assert not cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 6, 22, 0))
+
+
+def test_weekend_fresh_after_friday_settle(cache):
+    _refreshed(cache, "yahoo", "SPY@1d", _et(2026, 10, 9, 18, 0))
+    assert cache.is_fresh("yahoo", "SPY@1d", now=_et(2026, 10, 11, 12, 0))
+    _refreshed(cache, "yahoo", "QQQ@1d", _et(2026, 10, 9, 12, 0))
+    assert not cache.is_fresh("yahoo", "QQQ@1d", now=_et(2026, 10, 11, 12, 0))
+
+
+def test_crypto_uses_ttl_only(cache):
+    _refreshed(cache, "yahoo", "BTC-USD@1d", _et(2026, 10, 10, 9, 0))
+    assert cache.is_fresh("yahoo", "BTC-USD@1d", now=_et(2026, 10, 10, 9, 10))
+    assert not cache.is_fresh("yahoo", "BTC-USD@1d", now=_et(2026, 10, 11, 12, 0))
+
+
+def test_fred_uses_fred_ttl(cache):
+    _refreshed(cache, "fred", "DGS10", _et(2026, 10, 6, 8, 0))
+    assert cache.is_fresh("fred", "DGS10", now=_et(2026, 10, 6, 18, 0))
+    assert not cache.is_fresh("fred", "DGS10", now=_et(2026, 10, 7, 9, 0))
+
+
+def test_missing_file_is_not_fresh(cache):
+    assert not cache.is_fresh("yahoo", "SPY@1d")
+
+
+def test_merge_history_new_rows_win_and_sort():
+    cached = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.DatetimeIndex(["2026-10-01", "2026-10-02"]))
+    fresh = pd.DataFrame(
+        {"Close": [2.5, 3.0]},
+        index=pd.DatetimeIndex(["2026-10-02", "2026-10-03"]).tz_localize(NEW_YORK),
+    )
+    merged = merge_history(cached, fresh)
+    assert merged.index.tz is None
+    assert list(merged["Close"]) == [1.0, 2.5, 3.0]
+
+
+def test_merge_history_handles_empty_sides():
+    frame = pd.DataFrame({"Close": [1.0]}, index=pd.DatetimeIndex(["2026-10-01"]))
+    assert merge_history(None, frame) is not None
+    assert merge_history(frame, None).equals(frame)
+    assert merge_history(frame, frame.iloc[:0]).equals(frame)
+
+
+def test_read_write_round_trip(cache):
+    frame = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.DatetimeIndex(["2026-10-01", "2026-10-02"]))
+    cache.write("yahoo", "^GSPC@1d", frame)
+    pd.testing.assert_frame_equal(cache.read("yahoo", "^GSPC@1d"), frame, check_freq=False)
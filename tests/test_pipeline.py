@@ -0,0 +1,144 @@
+import time
+
+import pytest
+
+from newsletter import pipeline
+from newsletter.config import Settings
+from newsletter.models import FormInput, SectionDraft, SectionPlan
+from newsletter.pipeline import PartialRenderer, _PlanStreamParser
+
+FORM = FormInput(topic="Factor investing", tone="Professional", audience="Quants")
+
+PLAN = (
+    '{"newsletterSections": ['
+    '{"title": "Momentum {crash}", "description": "Why \\"momentum\\" broke"},'
+    ' {"title": "Rates", "description": "Curve moves"}'
+    "]}"
+)
+
+
+def test_plan_parser_yields_sections_as_they_complete():
+    parser = _PlanStreamParser()
+    found = []
+    for i in range(0, len(PLAN), 7):
+        found.extend(parser.feed(PLAN[i:i + 7]))
+    assert found == [
+        SectionPlan(title="Momentum {crash}", description='Why "momentum" broke'),
+        SectionPlan(title="Rates", description="Curve moves"),
+    ]
+
+
+def test_plan_parser_emits_a_section_once_its_object_closes():
+    parser = _PlanStreamParser()
+    cut = PLAN.index("},") + 1
+    assert parser.feed(PLAN[:cut - 1]) == []
+    assert [s.title for s in parser.feed(PLAN[cut - 1:cut])] == ["Momentum {crash}"]
+
+
+def test_plan_parser_ignores_text_after_the_array():
+    parser = _PlanStreamParser()
+    parser.feed(PLAN)
+    assert parser.feed(' {"title": "Late"}') == []
+
+
+def test_plan_parser_skips_malformed_objects():
+    parser = _PlanStreamParser()
+    found = parser.feed('Sure! {"newsletterSections": [{"description": "no title"}, {"title": "Ok"}]}')
+    assert [s.title for s in found] == ["Ok"]
+
+
+def test_partial_renderer_shows_placeholders_then_streamed_text(tmp_path):
+    path = tmp_path / "newsletter.html"
+    settings = Settings(_env_file=None, template_cache_dir=None)
+    sections = [SectionPlan(title="Value"), SectionPlan(title="Momentum")]
+    preview = PartialRenderer(settings, str(path), sections, min_interval=0)
+
+    preview.update(0, "<p>Value spreads widened")
+    html = path.read_text(encoding="utf-8")
+    assert "Value spreads widened" in html
+    assert PartialRenderer.PLACEHOLDER in html
+
+    preview.complete(1, SectionDraft(title="Momentum", html="<p>Momentum crashed.</p>"))
+    html = path.read_text(encoding="utf-8")
+    assert "Momentum crashed." in html
+    assert PartialRenderer.PLACEHOLDER not in html
+
+
+def test_partial_renderer_throttles_updates_but_not_completions(tmp_path):
+    path = tmp_path / "newsletter.html"
+    settings = Settings(_env_file=None, template_cache_dir=None)
+    sections = [SectionPlan(title="Value"), SectionPlan(title="Momentum")]
+    preview = PartialRenderer(settings, str(path), sections, min_interval=3600)
+
+    preview.complete(1, SectionDraft(title="Momentum", html="<p>momentum done</p>"))
+    preview.update(0, "<p>streaming value")
+    assert "streaming value" not in path.read_text(encoding="utf-8")
+    preview.complete(0, SectionDraft(title="Value", html="<p>value done</p>"))
+    assert "value done" in path.read_text(encoding="utf-8")
+
+
+def _settings(**overrides) -> Settings:
+    options = {"enable_market_data": False, "template_cache_dir": None, "max_words": 10000}
+    options.update(overrides)
+    return Settings(_env_file=None, **options)
+
+
+def _fake_draft(settings, form, section, on_text=None, research=None):
+    if on_text:
+        on_text(f"<p>drafting {section.title}")
+    return SectionDraft(title=section.title, html=f"<p>drafted {section.title}</p>")
+
+
+def test_run_pipeline_preview_ignores_a_failed_market_section(tmp_path, monkeypatch):
+    def failing_market(settings, form):
+        raise RuntimeError("yahoo down")
+
+    monkeypatch.setattr(pipeline, "generate_market_data_section", failing_market)
+    monkeypatch.setattr(pipeline, "plan_sections", lambda settings, form: [SectionPlan(title="Value")])
+    monkeypatch.setattr(pipeline, "draft_section", _fake_draft)
+    monkeypatch.setattr(pipeline, "compose_subject", lambda settings, form, text: "Subject")
+    preview = tmp_path / "newsletter.html"
+
+    newsletter = pipeline.run_pipeline(_settings(enable_market_data=True), FORM, preview_path=str(preview))
+
+    assert "drafted Value" in newsletter.html
+    assert "drafted Value" in preview.read_text(encoding="utf-8")
+
+
+def test_run_pipeline_keeps_plan_order_skips_failures_and_places_market(monkeypatch):
+    plan = [SectionPlan(title=title) for title in ("Alpha", "Beta", "Gamma", "Delta")]
+    # Later sections finish first, so completion order differs from plan order
+    delays = {"Alpha": 0.15, "Beta": 0.1, "Gamma": 0.05, "Delta": 0.0}
+
+    def draft(settings, form, section, on_text=None, research=None):
+        time.sleep(delays[section.title])
+        if section.title == "Gamma":
+            raise ValueError("LLM failed")
+        return _fake_draft(settings, form, section)
+
+    monkeypatch.setattr(pipeline, "plan_sections", lambda settings, form: plan)
+    monkeypatch.setattr(pipeline, "draft_section", draft)
+    monkeypatch.setattr(pipeline, "compose_subject", lambda settings, form, text: "Subject")
+    monkeypatch.setattr(
+        pipeline, "generate_market_data_section",
+        lambda settings, form: SectionDraft(title="Market Data", html="<p>market snapshot</p>"),
+    )
+    settings = _settings(enable_market_data=True, market_data_position=1, max_concurrency=4)
+
+    html = pipeline.run_pipeline(settings, FORM).html
+
+    order = ["drafted Alpha", "market snapshot", "drafted Beta", "drafted Delta"]
+    positions = [html.index(text) for text in order]
+    assert positions == sorted(positions)
+    assert "Gamma" not in html
+
+
+def test_run_pipeline_fails_when_every_section_fails(monkeypatch):
+    def draft(settings, form, section, on_text=None, research=None):
+        raise ValueError("LLM failed")
+
+    monkeypatch.setattr(pipeline, "plan_sections", lambda settings, form: [SectionPlan(title="A"), SectionPlan(title="B")])
+    monkeypatch.setattr(pipeline, "draft_section", draft)
+
+    with pytest.raises(ValueError, match="All sections failed"):
+        pipeline.run_pipeline(_settings(), FORM)
@@ -0,0 +1,55 @@
+from newsletter.models import SearchResult, SectionPlan
+from newsletter.research import assign_sources, canonical_url
+
+
+def test_canonical_url_normalizes_scheme_host_and_slash():
+    assert canonical_url("http://WWW.Reuters.com/markets/") == "https://reuters.com/markets"
+    assert canonical_url("https://example.com") == "https://example.com/"
+
+
+def test_canonical_url_drops_tracking_params_and_sorts_the_rest():
+    url = "https://ft.com/content/x?utm_source=news&b=2&fbclid=abc&a=1#section"
+    assert canonical_url(url) == "https://ft.com/content/x?a=1&b=2"
+
+
+def test_canonical_url_keeps_params_that_only_look_like_tracking():
+    # Only exact names are tracking params (plus the utm_ prefix)
+    assert canonical_url("https://example.com/p?referrer=x&ref=y") == "https://example.com/p?referrer=x"
+
+
+def test_canonical_url_keeps_non_default_port():
+    assert canonical_url("https://example.com:8443/a") == "https://example.com:8443/a"
+
+
+def _result(url, text):
+    return SearchResult(url=url, title=text, content=text)
+
+
+def test_assign_sources_dedupes_and_sends_each_source_to_best_section():
+    sections = [
+        SectionPlan(title="Bond yields", description="Treasury curve"),
+        SectionPlan(title="Crypto", description="Bitcoin flows"),
+    ]
+    bonds = _result("https://example.com/bonds", "Treasury yields and the bond curve")
+    bitcoin = _result("https://example.com/btc", "Bitcoin ETF flows in crypto markets")
+    bitcoin_again = _result("http://www.example.com/btc/?utm_source=x", "Bitcoin ETF flows in crypto markets")
+
+    assigned = assign_sources(sections, [[bonds, bitcoin], [bitcoin_again]], per_section=3)
+
+    assert [str(r.url) for r in assigned[0]] == ["https://example.com/bonds"]
+    assert [str(r.url) for r in assigned[1]] == ["https://example.com/btc"]
+
+
+def test_assign_sources_falls_back_to_own_results_and_keeps_failures():
+    sections = [
+        SectionPlan(title="Bitcoin", description="crypto"),
+        SectionPlan(title="Equities", description="stocks"),
+        SectionPlan(title="Rates", description="bonds"),
+    ]
+    shared = _result("https://example.com/btc", "Bitcoin crypto")
+
+    assigned = assign_sources(sections, [[shared], [shared], None], per_section=3)
+
+    assert assigned[0] == [shared]
+    assert assigned[1] == [shared]  # nothing assigned, so its own top results
+    assert assigned[2] is None
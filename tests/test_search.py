@@ -0,0 +1,14 @@
+import asyncio
+
+from newsletter.config import Settings
+from newsletter.models import SearchResult
+from newsletter.search import _write_cache, atavily_search
+
+
+def test_async_search_serves_cached_results(tmp_path):
+    settings = Settings(_env_file=None, tavily_api_key=None, search_cache_path=str(tmp_path / "search.sqlite3"))
+    results = [SearchResult(url="https://example.com/a", title="A", content="body")]
+    _write_cache(settings, "momentum crash", results)
+
+    assert asyncio.run(atavily_search(settings, "momentum crash")) == results
+    assert asyncio.run(atavily_search(settings, "other query")) == []